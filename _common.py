@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the test scripts: a pooled HTTP session and gated console output
+"""
+
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Console output is on for direct runs and off under pytest unless TEST_VERBOSE=1
+VERBOSE = os.environ.get('TEST_VERBOSE', '0' if 'pytest' in sys.modules else '1') == '1'
+
+def vprint(*args, **kwargs):
+    """print() gated on VERBOSE; failures and errors use plain print()"""
+    if VERBOSE:
+        print(*args, **kwargs)
+
+# Transient gateway errors and dropped connections are retried with backoff instead of failing the test
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# One pooled keep-alive session, so repeated calls skip the TCP/TLS handshake
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+def post_batch(base_url, payloads, timeout=120):
+    """POST several /optimize-meal requests as one /optimize-meal/batch call"""
+    return SESSION.post(f"{base_url}/optimize-meal/batch", json={"batch": payloads}, timeout=timeout)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Backend Server for Meal Optimization
-Simple server with only two endpoints: /health and /optimize-meal
+Simple server with /health, /optimize-meal and /optimize-meal/batch endpoints
 """
 
 from flask import Flask, request, jsonify
@@ -24,21 +24,25 @@ def health():
         "message": "Server is running"
     })
 
-@app.route('/optimize-meal', methods=['POST'])
-def optimize_meal():
-    """Advanced single meal optimization endpoint with automatic helper ingredients"""
+# Fields every optimization request must carry
+REQUIRED_FIELDS = ('rag_response', 'target_macros', 'user_preferences', 'meal_type')
+
+# One request per meal of the day; keeps a single POST from queueing unbounded optimizer runs
+MAX_BATCH_REQUESTS = 6
+
+def _optimize_request(request_data):
+    """Validate and run one optimization request, returning (body, status_code)"""
+    if not request_data:
+        return {"error": "No request data provided"}, 400
+    if not isinstance(request_data, dict):
+        return {"error": "Request data must be a JSON object"}, 400
+    
+    # Validate required fields
+    for field in REQUIRED_FIELDS:
+        if field not in request_data:
+            return {"error": f"Missing required field: {field}"}, 400
+    
     try:
-        request_data = request.get_json()
-        
-        if not request_data:
-            return jsonify({"error": "No request data provided"}), 400
-        
-        # Validate required fields
-        required_fields = ['rag_response', 'target_macros', 'user_preferences', 'meal_type']
-        for field in required_fields:
-            if field not in request_data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
         # Extract data
         rag_response = request_data['rag_response']
         target_macros = request_data['target_macros']
@@ -58,19 +62,55 @@ def optimize_meal():
         )
         
         print(f"✅ Advanced optimization completed!")
-        return jsonify(result)
+        return result, 200
         
+    except Exception as e:
+        return {
+            "error": f"Advanced meal optimization failed: {str(e)}",
+            "status": "error"
+        }, 500
+
+@app.route('/optimize-meal', methods=['POST'])
+def optimize_meal():
+    """Advanced single meal optimization endpoint with automatic helper ingredients"""
+    try:
+        request_data = request.get_json()
     except Exception as e:
         return jsonify({
             "error": f"Advanced meal optimization failed: {str(e)}",
             "status": "error"
         }), 500
+    
+    body, status = _optimize_request(request_data)
+    return jsonify(body), status
+
+@app.route('/optimize-meal/batch', methods=['POST'])
+def optimize_meal_batch():
+    """Run several optimization requests sent as {"batch": [request, ...]} in one round-trip"""
+    try:
+        request_data = request.get_json()
+    except Exception:
+        return jsonify({"error": "Invalid JSON body"}), 400
+    
+    batch = request_data.get('batch') if isinstance(request_data, dict) else None
+    if not isinstance(batch, list):
+        return jsonify({"error": "Missing required field: batch"}), 400
+    if len(batch) > MAX_BATCH_REQUESTS:
+        return jsonify({"error": f"Batch too large: {len(batch)} requests (max {MAX_BATCH_REQUESTS})"}), 413
+    
+    # Each entry keeps its own status so one bad request does not fail the rest
+    results = []
+    for item in batch:
+        body, status = _optimize_request(item)
+        results.append({"status": status, "result": body})
+    return jsonify({"results": results})
 
 if __name__ == '__main__':
     print("🚀 Starting Meal Optimization Server...")
     print("📡 Endpoints:")
     print("   - GET  /health")
     print("   - POST  /optimize-meal")
+    print("   - POST  /optimize-meal/batch")
 
     # Get port from environment variable (for Render) or use default
     port = int(os.environ.get('PORT', 5000))
@@ -1,6 +1,8 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Dict, Optional, Any
 import uvicorn
 from optimization_engine import MealOptimizationEngine
@@ -11,6 +13,8 @@ from models import (
 from database import DatabaseManager
 import logging
 import asyncio
+import hashlib
+import json
 import os
 import traceback
 
@@ -41,6 +45,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (ingredient catalog, meal plans) for clients sending Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Initialize components with error handling
 db_manager = None
 optimization_engine = None
@@ -387,8 +394,7 @@ async def add_ingredients(ingredients: List[Ingredient]):
         logger.error(f"Failed to add ingredients: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to add ingredients: {str(e)}")
 
-@app.get("/ingredients")
-async def get_ingredients():
+async def _list_ingredients() -> Dict[str, Any]:
     """Get all available ingredients"""
     try:
         if db_manager is None:
@@ -405,6 +411,20 @@ async def get_ingredients():
         logger.error(f"Failed to get ingredients: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get ingredients: {str(e)}")
 
+@app.get("/ingredients")
+async def get_ingredients(if_none_match: Optional[str] = Header(None)):
+    """Get all available ingredients; clients holding the current ETag get 304 Not Modified"""
+    ingredients = await _list_ingredients()
+    
+    # Encode the same way JSONResponse does; the tag is weak because GZipMiddleware may re-encode the body
+    content = json.dumps(
+        jsonable_encoder(ingredients), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    etag = f'W/"{hashlib.sha256(content).hexdigest()}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
 @app.get("/meal-times")
 async def get_meal_times():
     """Get available meal times"""
@@ -419,6 +439,50 @@ async def get_meal_times():
         ]
     }
 
+# One of each operation; keeps a single POST from queueing unbounded optimization runs
+MAX_BATCH_OPERATIONS = 4
+
+class BatchOperation(BaseModel):
+    """One operation inside a /batch request"""
+    op: str = Field(..., description="Operation: health, ingredients, test-rag-connection or optimize-rag-meal")
+    payload: Optional[Dict[str, Any]] = Field(None, description="Request body for operations that take one")
+
+async def _run_batch_operation(operation: BatchOperation) -> Dict[str, Any]:
+    """Run one batched operation through its endpoint handler"""
+    try:
+        if operation.op == "health":
+            result = await health_check()
+        elif operation.op == "ingredients":
+            result = await _list_ingredients()
+        elif operation.op == "test-rag-connection":
+            result = await test_rag_connection()
+        elif operation.op == "optimize-rag-meal":
+            result = await optimize_rag_meal(RAGRequest(**(operation.payload or {})))
+        else:
+            return {"op": operation.op, "status": 400, "result": {"detail": f"Unknown operation: {operation.op}"}}
+        return {"op": operation.op, "status": 200, "result": result}
+    except HTTPException as e:
+        return {"op": operation.op, "status": e.status_code, "result": {"detail": e.detail}}
+    except ValidationError as e:
+        return {"op": operation.op, "status": 422, "result": {"detail": e.errors()}}
+
+@app.post("/batch")
+async def batch(operations: List[BatchOperation]):
+    """
+    Run several operations in one round-trip
+    
+    Body is a list like [{"op": "health"}, {"op": "optimize-rag-meal", "payload": {...}}];
+    operations run in order within one request, and results come back in the same order
+    """
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(operations)} operations (max {MAX_BATCH_OPERATIONS})"
+        )
+    
+    results = await asyncio.gather(*(_run_batch_operation(operation) for operation in operations))
+    return {"results": list(results)}
+
 if __name__ == "__main__":
     # For local development only
     host = "127.0.0.1"  # Local development
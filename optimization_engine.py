@@ -3,6 +3,7 @@ import pandas as pd
 from typing import List, Dict, Tuple, Optional, Any
 import time as time_module
 import logging
+from functools import lru_cache
 from models import (
     Ingredient, MealPlan, MealItem, NutritionalTarget, 
     UserPreferences, OptimizationResult, MealTime
@@ -2030,3 +2031,9 @@ class SingleMealOptimizer:
             'total_ingredients': total_count,
             'enhancement_ratio': round(supplements_count / max(original_count, 1), 2)
         }
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> MealOptimizationEngine:
+    """Shared MealOptimizationEngine instance, built once per process"""
+    return MealOptimizationEngine()
@@ -2,6 +2,7 @@ import logging
 import time
 from typing import Dict, List, Optional, Union
 import random
+from functools import lru_cache
 import numpy as np
 
 # Try to import optimization libraries
@@ -20,7 +21,7 @@ except ImportError:
     logging.warning("DEAP not available. Genetic Algorithm will be skipped.")
 
 try:
-    from scipy.optimize import differential_evolution
+    from scipy.optimize import differential_evolution, linprog
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
@@ -1207,6 +1208,9 @@ class RAGMealOptimizer:
         """
         Relax calorie constraint in PuLP to allow up to 10% above target.
         """
+        # Small problems are solved in-process with HiGHS instead of spawning CBC
+        if SCIPY_AVAILABLE and len(ingredients) <= 8:
+            return self._linear_optimize_highs(ingredients, target_macros)
         try:
             from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus
             prob = LpProblem("Meal_Optimization", LpMinimize)
@@ -1249,6 +1253,57 @@ class RAGMealOptimizer:
             logger.error(f"PuLP optimization error: {e}")
             return {'method': 'PuLP', 'quantities': [0.0] * len(ingredients), 'success': False}
 
+    def _linear_optimize_highs(self, ingredients: List[Dict], target_macros: Dict) -> Dict:
+        """
+        Same LP as _linear_optimize_pulp, solved in-process with scipy's HiGHS backend.
+        """
+        n = len(ingredients)
+        try:
+            macros = ['protein', 'carbs', 'fat']
+            per_gram = np.array(
+                [[ing.get(f'{m}_per_100g', 0) for m in ['calories'] + macros] for ing in ingredients],
+                dtype=np.float64
+            ).reshape(n, 4).T / 100
+            calories_row, macro_rows = per_gram[0], per_gram[1:]
+            targets = np.array([target_macros[m] for m in macros], dtype=np.float64)
+            
+            # Variables are [x_0..x_{n-1}, dev_protein, dev_carbs, dev_fat]; minimize the summed deviations
+            c = np.concatenate([np.zeros(n), np.ones(3)])
+            eye = np.eye(3)
+            zeros = np.zeros((3, 3))
+            scaled = macro_rows / targets[:, None]
+            A_ub = np.vstack([
+                np.hstack([scaled, -eye]),                              # (total - target) / target <= dev
+                np.hstack([-scaled, -eye]),                             # (target - total) / target <= dev
+                np.hstack([-macro_rows, zeros]),                        # total >= 95% of target
+                np.concatenate([calories_row, np.zeros(3)])[None, :],   # calories <= 110% of target
+                np.concatenate([-calories_row, np.zeros(3)])[None, :],  # calories >= 90% of target
+            ])
+            b_ub = np.concatenate([
+                np.ones(3),
+                -np.ones(3),
+                -0.95 * targets,
+                [target_macros['calories'] * 1.1, -target_macros['calories'] * 0.9],
+            ])
+            bounds = [(0, float(ing.get('max_quantity', 500))) for ing in ingredients] + [(0, None)] * 3
+            
+            result = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+            if result.status != 0:
+                logger.warning(f"HiGHS optimization failed: {result.message}")
+                return {'method': 'PuLP', 'quantities': [0.0] * n}
+            
+            quantities = [float(q) for q in result.x[:n]]
+            
+            # Post-process to ensure minimum quantities for used ingredients
+            for i in range(n):
+                if quantities[i] > 0.1 and quantities[i] < 10.0:
+                    quantities[i] = 10.0
+            
+            return {'method': 'PuLP', 'quantities': quantities, 'success': True}
+        except Exception as e:
+            logger.error(f"HiGHS optimization error: {e}")
+            return {'method': 'PuLP', 'quantities': [0.0] * n, 'success': False}
+
     def _setup_deap(self):
         try:
             # Clear any existing creators to avoid conflicts
@@ -1548,30 +1603,34 @@ class RAGMealOptimizer:
         
         return score
 
+    def _macro_matrix(self, ingredients: List[Dict]) -> np.ndarray:
+        """Stack per-100g calories, protein, carbs and fat into an (n, 4) array"""
+        return np.array(
+            [[ing.get('calories_per_100g', 0.0), ing.get('protein_per_100g', 0.0),
+              ing.get('carbs_per_100g', 0.0), ing.get('fat_per_100g', 0.0)] for ing in ingredients],
+            dtype=np.float64
+        ).reshape(-1, 4)
+
     def _calculate_final_meal(self, ingredients: List[Dict], quantities: List[float]) -> Dict:
-        totals = {'calories': 0.0, 'protein': 0.0, 'carbs': 0.0, 'fat': 0.0}
         n = min(len(ingredients), len(quantities))
-        for i in range(n):
-            q = float(quantities[i]) / 100.0
-            totals['calories'] += ingredients[i].get('calories_per_100g', 0.0) * q
-            totals['protein']  += ingredients[i].get('protein_per_100g', 0.0)  * q
-            totals['carbs']    += ingredients[i].get('carbs_per_100g', 0.0)    * q
-            totals['fat']      += ingredients[i].get('fat_per_100g', 0.0)      * q
-        return totals
+        q = np.asarray(quantities[:n], dtype=np.float64)
+        totals = (self._macro_matrix(ingredients[:n]).T @ q) / 100.0
+        return dict(zip(('calories', 'protein', 'carbs', 'fat'), map(float, totals)))
 
     def _check_target_achievement(self, totals: Dict, target_macros: Dict) -> Dict:
         """
         Relax calorie tolerance to ±10% and keep ±5% for other macros.
         Overall achievement is True if at least 2 out of 4 macros are achieved.
         """
-        achievement = {}
-        for m, t in target_macros.items():
-            a = totals.get(m, 0)
-            if m == 'calories':
-                achieved = (a >= t * 0.90) and (a <= t * 1.10)  # Changed to ±10%
-            else:
-                achieved = (a >= t * 0.95) and (a <= t * 1.05)
-            achievement[m] = achieved
+        macros = list(target_macros)
+        targets = np.array([target_macros[m] for m in macros], dtype=np.float64)
+        actual = np.array([totals.get(m, 0) for m in macros], dtype=np.float64)
+        is_calories = np.array([m == 'calories' for m in macros], dtype=bool)
+        lower = np.where(is_calories, 0.90, 0.95)  # Changed to ±10% for calories
+        upper = np.where(is_calories, 1.10, 1.05)
+        
+        achieved = (actual >= targets * lower) & (actual <= targets * upper)
+        achievement = {m: bool(ok) for m, ok in zip(macros, achieved)}
         
         # Overall achievement: True if at least 2 out of 4 macros are achieved
         achieved_count = sum(achievement.values())
@@ -4997,4 +5056,10 @@ class RAGMealOptimizer:
         
     # REMOVED: _run_genetic_algorithm_final - Unrealistic method with extreme parameters
 
-            
\ No newline at end of file
+            
+
+
+@lru_cache(maxsize=1)
+def get_optimizer() -> RAGMealOptimizer:
+    """Shared RAGMealOptimizer instance, built once per process"""
+    return RAGMealOptimizer()
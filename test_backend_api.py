@@ -4,116 +4,188 @@ Test script for Backend API
 Tests the /optimize-single-meal endpoint
 """
 
-import requests
+import asyncio
+import httpx
+import io
 import json
+import sys
 import time
 
-def test_backend_api():
-    """Test the backend API endpoints"""
-    
-    base_url = "http://localhost:5000"
-    
-    print("🧪 Testing Backend API...")
-    print("=" * 50)
-    
-    # Test 1: Health Check
-    print("1. Testing Health Check...")
+# Prefer orjson for JSON encoding and decoding when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# httpx only speaks HTTP/2 when the h2 package (httpx[http2]) is installed
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Run the event loop on uvloop (libuv) instead of the default selector loop when it is installed
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+BASE_URL = "http://localhost:5000"
+
+# Sample request data, serialized once at import
+REQUEST_DATA = {
+    "rag_response": {
+        "meal_suggestions": ["Persian breakfast with traditional ingredients"]
+    },
+    "target_macros": {
+        "calories": 2000,
+        "protein": 150,
+        "carbohydrates": 200,
+        "fat": 65
+    },
+    "user_preferences": {
+        "dietary_restrictions": [],
+        "allergies": [],
+        "preferred_cuisines": ["persian"]
+    },
+    "user_id": "user_123",
+    "meal_type": "lunch"
+}
+REQUEST_BODY = orjson.dumps(REQUEST_DATA) if ORJSON_AVAILABLE else json.dumps(REQUEST_DATA).encode()
+
+def wait_ready(timeout: float = 10.0):
+    """Poll /health with exponential backoff until the server answers"""
+    deadline = time.monotonic() + timeout
+    delay = 0.02
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{BASE_URL}/health", timeout=0.5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    raise RuntimeError(f"Server at {BASE_URL} not ready after {timeout:.0f}s")
+
+async def check_health(client: httpx.AsyncClient) -> list:
+    """Probe /health and return the report lines"""
+    lines = ["1. Testing Health Check..."]
     try:
-        response = requests.get(f"{base_url}/health")
+        response = await client.get("/health")
         if response.status_code == 200:
-            print("   ✅ Health check passed")
-            print(f"   Response: {response.json()}")
+            lines.append("   ✅ Health check passed")
+            lines.append(f"   Response: {_loads(response.content)}")
         else:
-            print(f"   ❌ Health check failed: {response.status_code}")
+            lines.append(f"   ❌ Health check failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Health check error: {e}")
-    
-    print()
-    
-    # Test 2: Get Ingredients
-    print("2. Testing Get Ingredients...")
+        lines.append(f"   ❌ Health check error: {e}")
+    return lines
+
+async def check_ingredients(client: httpx.AsyncClient) -> list:
+    """Probe /api/ingredients and return the report lines"""
+    lines = ["2. Testing Get Ingredients..."]
     try:
-        response = requests.get(f"{base_url}/api/ingredients")
+        response = await client.get("/api/ingredients")
         if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Ingredients loaded: {data['total_count']} items")
+            data = _loads(response.content)
+            lines.append(f"   ✅ Ingredients loaded: {data['total_count']} items")
         else:
-            print(f"   ❌ Get ingredients failed: {response.status_code}")
+            lines.append(f"   ❌ Get ingredients failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Get ingredients error: {e}")
-    
-    print()
-    
-    # Test 3: Main Optimization Endpoint
-    print("3. Testing Main Optimization Endpoint...")
-    
-    # Sample request data
-    request_data = {
-        "rag_response": {
-            "meal_suggestions": ["Persian breakfast with traditional ingredients"]
-        },
-        "target_macros": {
-            "calories": 2000,
-            "protein": 150,
-            "carbohydrates": 200,
-            "fat": 65
-        },
-        "user_preferences": {
-            "dietary_restrictions": [],
-            "allergies": [],
-            "preferred_cuisines": ["persian"]
-        },
-        "user_id": "user_123",
-        "meal_type": "lunch"
-    }
+        lines.append(f"   ❌ Get ingredients error: {e}")
+    return lines
+
+async def check_optimization(client: httpx.AsyncClient) -> list:
+    """Call /optimize-single-meal and return the report lines"""
+    lines = ["3. Testing Main Optimization Endpoint..."]
     
     try:
         start_time = time.time()
-        response = requests.post(
-            f"{base_url}/optimize-single-meal",
-            json=request_data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/optimize-single-meal",
+            content=REQUEST_BODY
         )
         end_time = time.time()
         
         if response.status_code == 200:
-            data = response.json()
-            print("   ✅ Optimization successful!")
-            print(f"   Method: {data['optimization_result']['method']}")
-            print(f"   Computation Time: {data['optimization_result']['computation_time']}s")
-            print(f"   API Response Time: {(end_time - start_time):.3f}s")
+            data = _loads(response.content)
+            lines.append("   ✅ Optimization successful!")
+            lines.append(f"   Method: {data['optimization_result']['method']}")
+            lines.append(f"   Computation Time: {data['optimization_result']['computation_time']}s")
+            lines.append(f"   API Response Time: {(end_time - start_time):.3f}s")
             
             if data['meal']:
                 meal = data['meal']
-                print(f"   Meal Time: {meal['meal_time']}")
-                print(f"   Total Calories: {meal['total_calories']:.1f}")
-                print(f"   Total Protein: {meal['total_protein']:.1f}g")
-                print(f"   Total Carbs: {meal['total_carbs']:.1f}g")
-                print(f"   Total Fat: {meal['total_fat']:.1f}g")
-                print(f"   Cost Estimate: ${data['cost_estimate']}")
+                lines.append(f"   Meal Time: {meal['meal_time']}")
+                lines.append(f"   Total Calories: {meal['total_calories']:.1f}")
+                lines.append(f"   Total Protein: {meal['total_protein']:.1f}g")
+                lines.append(f"   Total Carbs: {meal['total_carbs']:.1f}g")
+                lines.append(f"   Total Fat: {meal['total_fat']:.1f}g")
+                lines.append(f"   Cost Estimate: ${data['cost_estimate']}")
                 
-                print(f"   Ingredients ({len(meal['items'])} items):")
-                for item in meal['items']:
-                    print(f"     - {item['ingredient']}: {item['quantity_grams']:.1f}g")
+                lines.append(f"   Ingredients ({len(meal['items'])} items):")
+                lines.extend([f"     - {item['ingredient']}: {item['quantity_grams']:.1f}g" for item in meal['items']])
             
-            print(f"   Target Achievement:")
+            lines.append(f"   Target Achievement:")
             for target, achieved in data['target_achievement'].items():
                 status = "✅" if achieved else "❌"
-                print(f"     {target}: {status}")
-                
+                lines.append(f"     {target}: {status}")
+        
         else:
-            print(f"   ❌ Optimization failed: {response.status_code}")
-            print(f"   Error: {response.text}")
-            
+            lines.append(f"   ❌ Optimization failed: {response.status_code}")
+            lines.append(f"   Error: {response.text}")
+    
     except Exception as e:
-        print(f"   ❌ Optimization error: {e}")
+        lines.append(f"   ❌ Optimization error: {e}")
+    return lines
+
+_CHECKS = (check_health, check_ingredients, check_optimization)
+
+async def _warmup(client: httpx.AsyncClient, connections: int):
+    """Open one pooled connection per concurrent probe so the timed probe sees steady-state latency"""
+    # Concurrent HEADs each need their own HTTP/1.1 connection, which then stays idle in the pool;
+    # failures are ignored and resurface in the probes themselves
+    await asyncio.gather(
+        *(client.head("/health", timeout=5) for _ in range(connections)),
+        return_exceptions=True
+    )
+
+async def run_backend_checks() -> list:
+    """Run the three independent probes concurrently on one pooled (HTTP/2 when available) client"""
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=HTTP2_AVAILABLE,
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        headers={"Content-Type": "application/json"}
+    ) as client:
+        await _warmup(client, len(_CHECKS))
+        return await asyncio.gather(*(check(client) for check in _CHECKS))
+
+def test_backend_api():
+    """Test the backend API endpoints"""
+    
+    # The whole report is collected and written once, in probe order
+    buf = io.StringIO()
+    p = buf.write
+    p("🧪 Testing Backend API...\n")
+    p("=" * 50 + "\n")
+    
+    for lines in asyncio.run(run_backend_checks()):
+        p("\n".join(lines) + "\n\n")
     
-    print()
-    print("🎯 API Test Complete!")
+    p("🎯 API Test Complete!\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
-    # Wait a bit for server to start
-    print("⏳ Waiting 3 seconds for server to start...")
-    time.sleep(3)
+    # Wait for the server to answer instead of sleeping a fixed time
+    print("⏳ Waiting for server to start...")
+    wait_ready()
     
     test_backend_api()
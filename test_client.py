@@ -2,93 +2,96 @@ import requests
 import json
 from models import MealRequest, NutritionalTarget, UserPreferences, Ingredient, MealTime
 
+# Test ingredients
+TEST_INGREDIENTS = [
+    Ingredient(
+        name="Chicken Breast",
+        name_fa="سینه مرغ",
+        calories_per_100g=165,
+        protein_per_100g=31,
+        carbs_per_100g=0,
+        fat_per_100g=3.6,
+        category="protein",
+        suitable_meals=[MealTime.BREAKFAST, MealTime.LUNCH, MealTime.DINNER]
+    ),
+    Ingredient(
+        name="Brown Rice",
+        name_fa="برنج قهوه‌ای",
+        calories_per_100g=111,
+        protein_per_100g=2.6,
+        carbs_per_100g=23,
+        fat_per_100g=0.9,
+        category="grain",
+        suitable_meals=[MealTime.LUNCH, MealTime.DINNER]
+    ),
+    Ingredient(
+        name="Spinach",
+        name_fa="اسفناج",
+        calories_per_100g=23,
+        protein_per_100g=2.9,
+        carbs_per_100g=3.6,
+        fat_per_100g=0.4,
+        category="vegetable",
+        suitable_meals=[MealTime.LUNCH, MealTime.DINNER]
+    ),
+    Ingredient(
+        name="Eggs",
+        name_fa="تخم مرغ",
+        calories_per_100g=155,
+        protein_per_100g=13,
+        carbs_per_100g=1.1,
+        fat_per_100g=11,
+        category="protein",
+        suitable_meals=[MealTime.BREAKFAST, MealTime.LUNCH, MealTime.DINNER]
+    ),
+    Ingredient(
+        name="Banana",
+        name_fa="موز",
+        calories_per_100g=89,
+        protein_per_100g=1.1,
+        carbs_per_100g=23,
+        fat_per_100g=0.3,
+        category="fruit",
+        suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK]
+    )
+]
+
+# Target macros
+TARGET_MACROS = NutritionalTarget(
+    calories=2000,
+    protein=150,
+    carbohydrates=200,
+    fat=65
+)
+
+# User preferences
+USER_PREFERENCES = UserPreferences(
+    dietary_restrictions=["vegetarian"],
+    allergies=["nuts"],
+    preferred_cuisines=["mediterranean", "persian"],
+    cooking_time_preference="medium",
+    budget_constraint=50.0
+)
+
+# Create meal request
+MEAL_REQUEST = MealRequest(
+    user_id="test_user_001",
+    ingredients=TEST_INGREDIENTS,
+    target_macros=TARGET_MACROS,
+    user_preferences=USER_PREFERENCES,
+    meal_times=list(MealTime),
+    optimization_priority="balanced"
+)
+
+# Serialized once with pydantic's own encoder, so each run posts ready-made bytes
+MEAL_REQUEST_BODY = MEAL_REQUEST.model_dump_json()
+
 def test_meal_optimization():
     """Test the meal optimization API"""
     
     # API endpoint
     base_url = "http://localhost:8000"
     
-    # Test ingredients
-    test_ingredients = [
-        Ingredient(
-            name="Chicken Breast",
-            name_fa="سینه مرغ",
-            calories_per_100g=165,
-            protein_per_100g=31,
-            carbs_per_100g=0,
-            fat_per_100g=3.6,
-            category="protein",
-            suitable_meals=[MealTime.BREAKFAST, MealTime.LUNCH, MealTime.DINNER]
-        ),
-        Ingredient(
-            name="Brown Rice",
-            name_fa="برنج قهوه‌ای",
-            calories_per_100g=111,
-            protein_per_100g=2.6,
-            carbs_per_100g=23,
-            fat_per_100g=0.9,
-            category="grain",
-            suitable_meals=[MealTime.LUNCH, MealTime.DINNER]
-        ),
-        Ingredient(
-            name="Spinach",
-            name_fa="اسفناج",
-            calories_per_100g=23,
-            protein_per_100g=2.9,
-            carbs_per_100g=3.6,
-            fat_per_100g=0.4,
-            category="vegetable",
-            suitable_meals=[MealTime.LUNCH, MealTime.DINNER]
-        ),
-        Ingredient(
-            name="Eggs",
-            name_fa="تخم مرغ",
-            calories_per_100g=155,
-            protein_per_100g=13,
-            carbs_per_100g=1.1,
-            fat_per_100g=11,
-            category="protein",
-            suitable_meals=[MealTime.BREAKFAST, MealTime.LUNCH, MealTime.DINNER]
-        ),
-        Ingredient(
-            name="Banana",
-            name_fa="موز",
-            calories_per_100g=89,
-            protein_per_100g=1.1,
-            carbs_per_100g=23,
-            fat_per_100g=0.3,
-            category="fruit",
-            suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK]
-        )
-    ]
-    
-    # Target macros
-    target_macros = NutritionalTarget(
-        calories=2000,
-        protein=150,
-        carbohydrates=200,
-        fat=65
-    )
-    
-    # User preferences
-    user_preferences = UserPreferences(
-        dietary_restrictions=["vegetarian"],
-        allergies=["nuts"],
-        preferred_cuisines=["mediterranean", "persian"],
-        cooking_time_preference="medium",
-        budget_constraint=50.0
-    )
-    
-    # Create meal request
-    meal_request = MealRequest(
-        user_id="test_user_001",
-        ingredients=test_ingredients,
-        target_macros=target_macros,
-        user_preferences=user_preferences,
-        meal_times=list(MealTime),
-        optimization_priority="balanced"
-    )
-    
     try:
         # Test health endpoint
         print("Testing health endpoint...")
@@ -101,7 +104,8 @@ def test_meal_optimization():
         print("Testing meal optimization...")
         optimization_response = requests.post(
             f"{base_url}/optimize-meal",
-            json=meal_request.model_dump()
+            data=MEAL_REQUEST_BODY,
+            headers={"Content-Type": "application/json"}
         )
         
         if optimization_response.status_code == 200:
@@ -128,10 +132,10 @@ def test_meal_optimization():
             
             print(f"\n📊 Daily Totals:")
             daily = result['daily_totals']
-            print(f"   Calories: {daily['calories']:.1f} / {target_macros.calories}")
-            print(f"   Protein: {daily['protein']:.1f}g / {target_macros.protein}g")
-            print(f"   Carbs: {daily['carbohydrates']:.1f}g / {target_macros.carbohydrates}g")
-            print(f"   Fat: {daily['fat']:.1f}g / {target_macros.fat}g")
+            print(f"   Calories: {daily['calories']:.1f} / {TARGET_MACROS.calories}")
+            print(f"   Protein: {daily['protein']:.1f}g / {TARGET_MACROS.protein}g")
+            print(f"   Carbs: {daily['carbohydrates']:.1f}g / {TARGET_MACROS.carbohydrates}g")
+            print(f"   Fat: {daily['fat']:.1f}g / {TARGET_MACROS.fat}g")
             
             if result['recommendations']:
                 print(f"\n💡 Recommendations:")
@@ -3,26 +3,44 @@
 Test using PowerShell
 """
 
+import re
 import subprocess
 import sys
 
+import httpx
+
+URL = "http://localhost:8000/optimize-rag-meal"
+
+# Status code of a formatted Invoke-WebRequest result, matched on the raw bytes
+_STATUS_RE = re.compile(rb'"?StatusCode"?\s*:\s*(\d+)')
+
 def test_endpoint():
     """Test endpoint using PowerShell"""
     try:
+        if sys.platform != "win32":
+            # PowerShell is a Windows tool here; elsewhere send the same request with httpx without spawning PowerShell
+            print("Testing endpoint with httpx...")
+            response = httpx.post(URL, timeout=30)
+            print(f"Status: {response.status_code}")
+            print(f"Output: {response.text}")
+            return
+        
         print("Testing endpoint with PowerShell...")
         
         # Test with PowerShell
         cmd = [
             "powershell", "-Command",
-            "Invoke-WebRequest -Uri 'http://localhost:8000/optimize-rag-meal' -Method POST"
+            f"Invoke-WebRequest -UseBasicParsing -Uri '{URL}' -Method POST"
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+        match = _STATUS_RE.search(result.stdout)
         
         print(f"Return code: {result.returncode}")
-        print(f"Output: {result.stdout}")
-        print(f"Error: {result.stderr}")
-        
+        print(f"Status: {int(match.group(1)) if match else 'unknown'}")
+        print(f"Output: {result.stdout.decode('utf-8', errors='replace')}")
+        print(f"Error: {result.stderr.decode('utf-8', errors='replace')}")
+    
     except Exception as e:
         print(f"Error: {e}")
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared request data for the RAG endpoint test clients
+"""
+
+from types import MappingProxyType
+
+# Read-only templates; encode requests with default=dict since JSON encoders reject mappingproxy
+RAG_RESPONSE = MappingProxyType({
+    "suggestions": [
+        {
+            "ingredients": [
+                {
+                    "name": "Ground Beef",
+                    "amount": 200,
+                    "calories": 400,
+                    "protein": 40,
+                    "carbs": 0,
+                    "fat": 30
+                }
+            ]
+        }
+    ]
+})
+
+TARGET_MACROS = MappingProxyType({
+    "calories": 2000.0,
+    "protein": 150.0,
+    "carbohydrates": 200.0,
+    "fat": 65.0
+})
+
+USER_PREFERENCES = MappingProxyType({
+    "dietary_restrictions": [],
+    "allergies": [],
+    "preferred_cuisines": ["persian"],
+    "calorie_preference": "moderate",
+    "protein_preference": "high",
+    "carb_preference": "moderate",
+    "fat_preference": "moderate"
+})
+
+def make_rag_request(user_id: str) -> dict:
+    """Build a RAG request from the shared templates, varying only the user id"""
+    return {
+        "rag_response": RAG_RESPONSE,
+        "target_macros": TARGET_MACROS,
+        "user_preferences": USER_PREFERENCES,
+        "user_id": user_id
+    }
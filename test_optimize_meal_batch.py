@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the /optimize-meal/batch endpoint: several meal types in one POST
+"""
+
+import requests
+
+from _common import post_batch
+
+BASE_URL = "http://localhost:5000"
+MEAL_TYPES = ("breakfast", "lunch", "dinner")
+
+def make_request(meal_type):
+    """Build a small /optimize-meal request for one meal type"""
+    return {
+        "rag_response": {
+            "ingredients": [
+                {
+                    "name": "Low-fat Yogurt",
+                    "protein_per_100g": 6,
+                    "carbs_per_100g": 8,
+                    "fat_per_100g": 2,
+                    "calories_per_100g": 60,
+                    "quantity_needed": 100
+                }
+            ]
+        },
+        "target_macros": {
+            "calories": 60,
+            "protein": 6,
+            "carbs": 8,
+            "fat": 2
+        },
+        "user_preferences": {
+            "diet_type": "balanced",
+            "allergies": [],
+            "preferences": []
+        },
+        "meal_type": meal_type
+    }
+
+def test_batch_isolates_bad_entries():
+    """Malformed entries get their own 400 while the valid one still runs"""
+    from backend_server import app
+    
+    client = app.test_client()
+    response = client.post("/optimize-meal/batch", json={"batch": [make_request("breakfast"), 1, "notadict", {}]})
+    
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [item["status"] for item in results] == [200, 400, 400, 400]
+    assert results[1]["result"]["error"] == "Request data must be a JSON object"
+    assert results[2]["result"]["error"] == "Request data must be a JSON object"
+
+def test_batch_rejects_oversized_and_malformed_bodies():
+    """Oversized batches get 413 and unparseable bodies get 400"""
+    from backend_server import app, MAX_BATCH_REQUESTS
+    
+    client = app.test_client()
+    oversized = {"batch": [make_request("breakfast")] * (MAX_BATCH_REQUESTS + 1)}
+    response = client.post("/optimize-meal/batch", json=oversized)
+    assert response.status_code == 413
+    
+    response = client.post("/optimize-meal/batch", data="{not json", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid JSON body"
+
+def run_meal_type_sweep():
+    """Optimize every meal type against the live server in one round-trip"""
+    print("🧪 Testing /optimize-meal/batch")
+    print("=" * 50)
+    
+    try:
+        response = post_batch(BASE_URL, [make_request(meal_type) for meal_type in MEAL_TYPES])
+        
+        if response.status_code == 200:
+            for meal_type, item in zip(MEAL_TYPES, response.json()["results"]):
+                status = "✅" if item["status"] == 200 else "❌"
+                print(f"   {status} {meal_type}: {item['status']}")
+        else:
+            print(f"❌ Batch request failed: {response.status_code}")
+            print(f"Error: {response.text[:500]}")
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Connection Error: Could not connect to server")
+        print("💡 Make sure the backend server is running on port 5000")
+        print("   Run: python backend_server.py")
+
+if __name__ == "__main__":
+    run_meal_type_sweep()
@@ -6,6 +6,8 @@ Displays output exactly as requested by the user
 
 import asyncio
 import json
+import math
+import numpy as np
 from models import NutritionalTarget, UserPreferences, MealTime, Ingredient, MealItem, MealPlan
 from typing import List, Dict
 
@@ -173,13 +175,12 @@ def calculate_optimal_quantities(ingredients: List[Ingredient], target: Nutritio
         current_nutrition["fat"] += ingredient.fat_per_100g * ratio
     
     # Calculate scaling factors to reach targets
-    calories_scale = target.calories / current_nutrition["calories"] if current_nutrition["calories"] > 0 else 1
-    protein_scale = target.protein / current_nutrition["protein"] if current_nutrition["protein"] > 0 else 1
-    carbs_scale = target.carbohydrates / current_nutrition["carbs"] if current_nutrition["carbs"] > 0 else 1
-    fat_scale = target.fat / current_nutrition["fat"] if current_nutrition["fat"] > 0 else 1
+    current = np.array([current_nutrition["calories"], current_nutrition["protein"], current_nutrition["carbs"], current_nutrition["fat"]], dtype=np.float64)
+    target_vec = np.array([target.calories, target.protein, target.carbohydrates, target.fat], dtype=np.float64)
+    scales = np.divide(target_vec, current, out=np.ones_like(target_vec), where=current > 0)
     
     # Use the highest scale factor to ensure we meet all targets
-    max_scale = max(calories_scale, protein_scale, carbs_scale, fat_scale)
+    max_scale = float(scales.max())
     
     # Calculate final quantities
     optimal_quantities = {}
@@ -228,7 +229,7 @@ def display_final_meal_plan(ingredients: List[Ingredient], quantities: Dict[str,
     print(f"   Fat: {total_fat:.1f}g")
     
     # Calculate cost estimate
-    total_cost = sum(ing.price_per_kg * quantities.get(ing.name, 100) / 1000 for ing in ingredients)
+    total_cost = math.fsum(ing.price_per_kg * quantities.get(ing.name, 100) * 0.001 for ing in ingredients)
     print(f"💰 Cost Estimate: ${total_cost:.2f}")
 
 async def optimize_persian_single_meal():
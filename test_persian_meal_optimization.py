@@ -6,6 +6,7 @@ Takes Persian ingredients, optimizes them, and adds more if needed to meet nutri
 
 import asyncio
 import json
+import numpy as np
 from optimization_engine import MealOptimizationEngine
 from models import NutritionalTarget, UserPreferences, MealTime, Ingredient, MealItem, MealPlan
 from typing import List, Dict, Tuple
@@ -126,35 +127,25 @@ class PersianMealOptimizer:
     
     def analyze_current_nutrition(self, ingredients: List[Ingredient]) -> Dict[str, float]:
         """Analyze current nutritional content of ingredients"""
-        total_calories = 0
-        total_protein = 0
-        total_carbs = 0
-        total_fat = 0
+        # Typical serving sizes; anything else counts as 100g
+        servings = {
+            "Nan-e Barbari": 50,
+            "Persian Butter": 10,
+            "Honey": 15,
+            "Black Tea Leaves": 5,
+            "Mast (Yogurt)": 50,
+            "Fresh Fig": 30,
+            "Persian Nuts Mix": 20
+        }
         
-        for ingredient in ingredients:
-            # Calculate based on typical serving sizes
-            if ingredient.name == "Nan-e Barbari":
-                serving = 50
-            elif ingredient.name == "Persian Butter":
-                serving = 10
-            elif ingredient.name == "Honey":
-                serving = 15
-            elif ingredient.name == "Black Tea Leaves":
-                serving = 5
-            elif ingredient.name == "Mast (Yogurt)":
-                serving = 50
-            elif ingredient.name == "Fresh Fig":
-                serving = 30
-            elif ingredient.name == "Persian Nuts Mix":
-                serving = 20
-            else:
-                serving = 100
-            
-            ratio = serving / 100
-            total_calories += ingredient.calories_per_100g * ratio
-            total_protein += ingredient.protein_per_100g * ratio
-            total_carbs += ingredient.carbs_per_100g * ratio
-            total_fat += ingredient.fat_per_100g * ratio
+        ratios = np.fromiter((servings.get(ing.name, 100) for ing in ingredients), dtype=np.float64, count=len(ingredients)) / 100.0
+        macros = np.array(
+            [[ing.calories_per_100g, ing.protein_per_100g, ing.carbs_per_100g, ing.fat_per_100g] for ing in ingredients],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        # cumsum adds the per-item products strictly in list order, like the original loop, so totals match it exactly
+        running = np.vstack([np.zeros((1, 4)), macros * ratios[:, None]]).cumsum(axis=0)
+        total_calories, total_protein, total_carbs, total_fat = (float(total) for total in running[-1])
         
         return {
             "calories": total_calories,
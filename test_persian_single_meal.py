@@ -4,289 +4,340 @@ Persian Single Meal Optimization
 Puts all ingredients in one lunch meal with proper quantities to meet daily targets
 """
 
-import asyncio
 import json
+import sys
+import numpy as np
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 from models import NutritionalTarget, UserPreferences, MealTime, Ingredient, MealItem, MealPlan
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
+# Prefer orjson for parsing the ingredients database when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Compile the quantity scaling kernel to native code when numba is installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Original serving sizes from user data, keyed by ingredient id; anything else starts from 100g
+BASE_SERVINGS = MappingProxyType({
+    "nan_barbari": 50,
+    "persian_butter": 10,
+    "honey": 15,
+    "black_tea": 5,
+    "mast_yogurt": 50,
+    "fresh_fig": 30,
+    "persian_nuts_mix": 20
+})
+
+# Column order of every macro vector and matrix in this module
+CAL, PROT, CARB, FAT = 0, 1, 2, 3
+
+# Pre-bound row templates for the per-ingredient report loops
+_ANALYSIS_ROW = "{:<20} {:<10g}g {:<10.1f} {:<10.1f}g {:<10.1f}g {:<10.1f}g".format
+_ITEM_ROW = "   - {}: {:.1f}g\n     Calories: {:.1f}, Protein: {:.1f}g, Carbs: {:.1f}g, Fat: {:.1f}g".format
+
+@lru_cache(maxsize=1)
 def create_persian_ingredients() -> List[Ingredient]:
-    """Create the exact Persian ingredients from the user's data"""
-    return [
-        Ingredient(
+    """Create the exact Persian ingredients from the user's data (cached, do not mutate)"""
+    # Trusted literals, so skip Pydantic validation with model_construct
+    ingredients = [
+        Ingredient.model_construct(
             id="nan_barbari",
             name="Nan-e Barbari",
             name_fa="نان بربری",
-            calories_per_100g=280,  # 140 cal / 50g * 100
-            protein_per_100g=8,     # 4g / 50g * 100
-            carbs_per_100g=54,      # 27g / 50g * 100
-            fat_per_100g=2,         # 1g / 50g * 100
+            calories_per_100g=280.0,  # 140 cal / 50g * 100
+            protein_per_100g=8.0,     # 4g / 50g * 100
+            carbs_per_100g=54.0,      # 27g / 50g * 100
+            fat_per_100g=2.0,         # 1g / 50g * 100
             category="grain",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=2.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="persian_butter",
             name="Persian Butter",
             name_fa="کره ایرانی",
-            calories_per_100g=720,  # 72 cal / 10g * 100
-            protein_per_100g=0,
-            carbs_per_100g=0,
-            fat_per_100g=80,        # 8g / 10g * 100
+            calories_per_100g=720.0,  # 72 cal / 10g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=0.0,
+            fat_per_100g=80.0,        # 8g / 10g * 100
             category="dairy",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=12.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="honey",
             name="Honey",
             name_fa="عسل",
-            calories_per_100g=307,  # 46 cal / 15g * 100
-            protein_per_100g=0,
-            carbs_per_100g=80,      # 12g / 15g * 100
-            fat_per_100g=0,
+            calories_per_100g=307.0,  # 46 cal / 15g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=80.0,      # 12g / 15g * 100
+            fat_per_100g=0.0,
             category="sweetener",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=20.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="black_tea",
             name="Black Tea Leaves",
             name_fa="چای سیاه",
-            calories_per_100g=40,   # 2 cal / 5g * 100
-            protein_per_100g=0,
-            carbs_per_100g=0,
-            fat_per_100g=0,
+            calories_per_100g=40.0,   # 2 cal / 5g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=0.0,
+            fat_per_100g=0.0,
             category="beverage",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=15.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="mast_yogurt",
             name="Mast (Yogurt)",
             name_fa="ماست",
-            calories_per_100g=60,   # 30 cal / 50g * 100
-            protein_per_100g=6,     # 3g / 50g * 100
-            carbs_per_100g=8,       # 4g / 50g * 100
-            fat_per_100g=2,         # 1g / 50g * 100
+            calories_per_100g=60.0,   # 30 cal / 50g * 100
+            protein_per_100g=6.0,     # 3g / 50g * 100
+            carbs_per_100g=8.0,       # 4g / 50g * 100
+            fat_per_100g=2.0,         # 1g / 50g * 100
             category="dairy",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=4.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="fresh_fig",
             name="Fresh Fig",
             name_fa="انجیر تازه",
-            calories_per_100g=67,   # 20 cal / 30g * 100
-            protein_per_100g=0,
-            carbs_per_100g=17,      # 5g / 30g * 100
-            fat_per_100g=0,
+            calories_per_100g=67.0,   # 20 cal / 30g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=17.0,      # 5g / 30g * 100
+            fat_per_100g=0.0,
             category="fruit",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=8.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="persian_nuts_mix",
             name="Persian Nuts Mix",
             name_fa="آجیل ایرانی",
-            calories_per_100g=600,  # 120 cal / 20g * 100
-            protein_per_100g=15,    # 3g / 20g * 100
-            carbs_per_100g=25,      # 5g / 20g * 100
-            fat_per_100g=50,        # 10g / 20g * 100
+            calories_per_100g=600.0,  # 120 cal / 20g * 100
+            protein_per_100g=15.0,    # 3g / 20g * 100
+            carbs_per_100g=25.0,      # 5g / 20g * 100
+            fat_per_100g=50.0,        # 10g / 20g * 100
             category="nuts",
             suitable_meals=[MealTime.LUNCH],  # Only lunch
             price_per_kg=25.0,
             availability=True
         )
     ]
-
-def analyze_persian_nutrition(ingredients: List[Ingredient]) -> Dict[str, float]:
-    """Analyze the nutritional content of Persian ingredients with their serving sizes"""
-    # Original serving sizes from user data
-    servings = {
-        "Nan-e Barbari": 50,
-        "Persian Butter": 10,
-        "Honey": 15,
-        "Black Tea Leaves": 5,
-        "Mast (Yogurt)": 50,
-        "Fresh Fig": 30,
-        "Persian Nuts Mix": 20
-    }
-    
-    total_calories = 0
-    total_protein = 0
-    total_carbs = 0
-    total_fat = 0
-    
-    print("📊 Persian Ingredients Nutritional Analysis:")
-    print("=" * 60)
-    print(f"{'Ingredient':<20} {'Serving':<10} {'Calories':<10} {'Protein':<10} {'Carbs':<10} {'Fat':<10}")
-    print("-" * 60)
     
-    for ingredient in ingredients:
-        serving = servings.get(ingredient.name, 100)
-        ratio = serving / 100
-        
-        calories = ingredient.calories_per_100g * ratio
-        protein = ingredient.protein_per_100g * ratio
-        carbs = ingredient.carbs_per_100g * ratio
-        fat = ingredient.fat_per_100g * ratio
-        
-        total_calories += calories
-        total_protein += protein
-        total_carbs += carbs
-        total_fat += fat
-        
-        print(f"{ingredient.name_fa:<20} {serving:<10}g {calories:<10.1f} {protein:<10.1f}g {carbs:<10.1f}g {fat:<10.1f}g")
+    # A missing serving would silently fall back to 100g and skew every total
+    missing = [ing.id for ing in ingredients if ing.id not in BASE_SERVINGS]
+    if missing:
+        raise ValueError(f"No base serving defined for Persian ingredients: {missing}")
     
-    print("-" * 60)
-    print(f"{'TOTAL':<20} {'':<10} {total_calories:<10.1f} {total_protein:<10.1f}g {total_carbs:<10.1f}g {total_fat:<10.1f}g")
+    return _register_macros(ingredients)
+
+def _ingredient_macros(ingredient: Ingredient) -> Tuple[float, float, float, float]:
+    """Read the four per-100g macros of an ingredient"""
+    return (ingredient.calories_per_100g, ingredient.protein_per_100g,
+            ingredient.carbs_per_100g, ingredient.fat_per_100g)
+
+def _register_macros(ingredients: List[Ingredient]) -> List[Ingredient]:
+    """Store each long-lived (cached) ingredient's macro tuple on the model itself"""
+    for ing in ingredients:
+        # Bypass pydantic's __setattr__, which rejects undeclared attributes
+        object.__setattr__(ing, "_macros", _ingredient_macros(ing))
+    return ingredients
+
+def base_serving_vector(ingredients: List[Ingredient]) -> np.ndarray:
+    """Base serving size in grams for each ingredient, aligned with ingredient_macro_matrix"""
+    return np.fromiter((BASE_SERVINGS.get(ing.id, 100) for ing in ingredients), dtype=np.float64, count=len(ingredients))
+
+def price_per_gram_vector(ingredients: List[Ingredient]) -> np.ndarray:
+    """Price per gram for each ingredient (unknown prices count as free)"""
+    return np.fromiter(((ing.price_per_kg or 0.0) / 1000 for ing in ingredients), dtype=np.float64, count=len(ingredients))
+
+def target_vector(target: NutritionalTarget) -> np.ndarray:
+    """Target calories, protein, carbs and fat in macro column order"""
+    return np.array([target.calories, target.protein, target.carbohydrates, target.fat], dtype=np.float64)
+
+def ingredient_macro_matrix(ingredients: List[Ingredient]) -> np.ndarray:
+    """Pack per-100g calories, protein, carbs and fat into an (N, 4) array"""
+    return np.array(
+        [getattr(ing, "_macros", None) or _ingredient_macros(ing) for ing in ingredients],
+        dtype=np.float64
+    ).reshape(-1, 4)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _compute_scale(macros: np.ndarray, base: np.ndarray, target: np.ndarray) -> float:
+        """Largest target/current ratio over the four macros at base quantities"""
+        current = np.zeros(4)
+        for i in range(macros.shape[0]):
+            ratio = base[i] / 100.0
+            for j in range(4):
+                current[j] += macros[i, j] * ratio
+        max_scale = 1.0 if current[0] <= 0 else target[0] / current[0]
+        for j in range(1, 4):
+            scale = 1.0 if current[j] <= 0 else target[j] / current[j]
+            if scale > max_scale:
+                max_scale = scale
+        return max_scale
+else:
+    def _compute_scale(macros: np.ndarray, base: np.ndarray, target: np.ndarray) -> float:
+        """Largest target/current ratio over the four macros at base quantities"""
+        current = base @ macros / 100
+        scales = np.divide(target, current, out=np.ones_like(target), where=current > 0)
+        return float(scales.max())
+
+@lru_cache(maxsize=1)
+def _persian_base_nutrition() -> np.ndarray:
+    """Base-serving nutrition of the fixed Persian set, folded into a constant matrix once"""
+    ingredients = create_persian_ingredients()
+    nutrition = ingredient_macro_matrix(ingredients) * (base_serving_vector(ingredients)[:, None] / 100)
+    nutrition.setflags(write=False)
+    return nutrition
+
+def base_nutrition_matrix(ingredients: List[Ingredient]) -> np.ndarray:
+    """Nutrition of each ingredient at its base serving, as an (N, 4) array"""
+    if ingredients is create_persian_ingredients():
+        return _persian_base_nutrition()
+    return ingredient_macro_matrix(ingredients) * (base_serving_vector(ingredients)[:, None] / 100)
+
+def analyze_persian_nutrition(ingredients: List[Ingredient]) -> np.ndarray:
+    """Analyze the nutritional content of Persian ingredients with their serving sizes"""
+    serving_vec = base_serving_vector(ingredients)
+    nutrition = base_nutrition_matrix(ingredients)
+    totals = nutrition.sum(axis=0)
+    
+    rows = [
+        "📊 Persian Ingredients Nutritional Analysis:",
+        "=" * 60,
+        f"{'Ingredient':<20} {'Serving':<10} {'Calories':<10} {'Protein':<10} {'Carbs':<10} {'Fat':<10}",
+        "-" * 60
+    ]
+    for ingredient, serving, (calories, protein, carbs, fat) in zip(ingredients, serving_vec, nutrition):
+        rows.append(_ANALYSIS_ROW(ingredient.name_fa, serving, calories, protein, carbs, fat))
+    rows.append("-" * 60)
+    rows.append(f"{'TOTAL':<20} {'':<10} {totals[CAL]:<10.1f} {totals[PROT]:<10.1f}g {totals[CARB]:<10.1f}g {totals[FAT]:<10.1f}g")
+    sys.stdout.write("\n".join(rows) + "\n")
     
-    return {
-        "calories": total_calories,
-        "protein": total_protein,
-        "carbs": total_calories,
-        "fat": total_fat
-    }
+    return totals
 
+@lru_cache(maxsize=1)
+def read_ingredients_json() -> List[Dict]:
+    """Read and parse the raw ingredients database file once per process"""
+    raw = Path('ingredients_database.json').read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+@lru_cache(maxsize=1)
 def load_ingredients_database() -> List[Ingredient]:
-    """Load additional ingredients from database for supplementation"""
+    """Load additional ingredients from database for supplementation (cached, do not mutate)"""
     try:
-        with open('ingredients_database.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return [Ingredient(**item) for item in data]
+        return _register_macros([Ingredient.model_validate(item) for item in read_ingredients_json()])
     except Exception as e:
         print(f"Warning: Could not load ingredients database: {e}")
         return []
 
-def find_supplements(current_nutrition: Dict[str, float], target: NutritionalTarget, db_ingredients: List[Ingredient]) -> List[Ingredient]:
+@lru_cache(maxsize=1)
+def load_ingredients_index() -> Tuple[Dict[str, List[Ingredient]], List[Ingredient]]:
+    """Bucket database ingredients by category, plus the fat-rich ones, for supplement lookups"""
+    db_ingredients = load_ingredients_database()
+    by_category = defaultdict(list)
+    for ing in db_ingredients:
+        by_category[ing.category].append(ing)
+    fat_rich = [ing for ing in db_ingredients if ing.fat_per_100g > 10]
+    return dict(by_category), fat_rich
+
+def find_supplements(current_nutrition: np.ndarray, target: NutritionalTarget, db_index: Tuple[Dict[str, List[Ingredient]], List[Ingredient]]) -> List[Ingredient]:
     """Find ingredients to supplement missing nutrition"""
     supplements = []
+    by_category, fat_rich = db_index
     
     # Calculate deficits
-    protein_deficit = max(0, target.protein - current_nutrition["protein"])
-    carbs_deficit = max(0, target.carbohydrates - current_nutrition["carbs"])
-    fat_deficit = max(0, target.fat - current_nutrition["fat"])
-    calories_deficit = max(0, target.calories - current_nutrition["calories"])
+    calories_deficit, protein_deficit, carbs_deficit, fat_deficit = np.maximum(0, target_vector(target) - current_nutrition)
     
     print(f"\n🎯 Target vs Current:")
     print(f"   Target:     {target.calories:.1f} cal, {target.protein:.1f}g protein, {target.carbohydrates:.1f}g carbs, {target.fat:.1f}g fat")
-    print(f"   Current:    {current_nutrition['calories']:.1f} cal, {current_nutrition['protein']:.1f}g protein, {current_nutrition['carbs']:.1f}g carbs, {current_nutrition['fat']:.1f}g fat")
+    print(f"   Current:    {current_nutrition[CAL]:.1f} cal, {current_nutrition[PROT]:.1f}g protein, {current_nutrition[CARB]:.1f}g carbs, {current_nutrition[FAT]:.1f}g fat")
     print(f"   Deficits:   {calories_deficit:.1f} cal, {protein_deficit:.1f}g protein, {carbs_deficit:.1f}g carbs, {fat_deficit:.1f}g fat")
     
     print(f"\n🔧 Adding Supplements:")
     
     # Add protein supplements
     if protein_deficit > 0:
-        protein_ingredients = [ing for ing in db_ingredients if ing.category == "protein" and ing.protein_per_100g > 20]
-        if protein_ingredients:
-            supplements.append(protein_ingredients[0])
-            print(f"   ➕ Protein: {protein_ingredients[0].name} ({protein_ingredients[0].protein_per_100g:.1f}g/100g)")
+        protein_ingredient = next((ing for ing in by_category.get("protein", ()) if ing.protein_per_100g > 20), None)
+        if protein_ingredient:
+            supplements.append(protein_ingredient)
+            print(f"   ➕ Protein: {protein_ingredient.name} ({protein_ingredient.protein_per_100g:.1f}g/100g)")
     
     # Add carb supplements
     if carbs_deficit > 0:
-        carb_ingredients = [ing for ing in db_ingredients if ing.category == "grain" and ing.carbs_per_100g > 20]
-        if carb_ingredients:
-            supplements.append(carb_ingredients[0])
-            print(f"   ➕ Carbs: {carb_ingredients[0].name} ({carb_ingredients[0].carbs_per_100g:.1f}g/100g)")
+        carb_ingredient = next((ing for ing in by_category.get("grain", ()) if ing.carbs_per_100g > 20), None)
+        if carb_ingredient:
+            supplements.append(carb_ingredient)
+            print(f"   ➕ Carbs: {carb_ingredient.name} ({carb_ingredient.carbs_per_100g:.1f}g/100g)")
     
     # Add fat supplements
     if fat_deficit > 0:
-        fat_ingredients = [ing for ing in db_ingredients if ing.fat_per_100g > 10]
-        if fat_ingredients:
-            supplements.append(fat_ingredients[0])
-            print(f"   ➕ Fat: {fat_ingredients[0].name} ({fat_ingredients[0].fat_per_100g:.1f}g/100g)")
+        if fat_rich:
+            supplements.append(fat_rich[0])
+            print(f"   ➕ Fat: {fat_rich[0].name} ({fat_rich[0].fat_per_100g:.1f}g/100g)")
     
     # Add vegetable for fiber and micronutrients
-    veg_ingredients = [ing for ing in db_ingredients if ing.category == "vegetable"]
+    veg_ingredients = by_category.get("vegetable")
     if veg_ingredients:
         supplements.append(veg_ingredients[0])
         print(f"   ➕ Vegetable: {veg_ingredients[0].name}")
     
     return supplements
 
-def calculate_optimal_quantities(ingredients: List[Ingredient], target: NutritionalTarget) -> Dict[str, float]:
-    """Calculate optimal quantities for each ingredient to meet daily targets"""
+def build_meal(ingredients: List[Ingredient], target: NutritionalTarget) -> MealPlan:
+    """Scale base servings to meet daily targets and build the single lunch meal in one pass"""
     print(f"\n🧮 Calculating Optimal Quantities...")
     
     # Start with base quantities (original serving sizes)
-    base_quantities = {
-        "Nan-e Barbari": 50,
-        "Persian Butter": 10,
-        "Honey": 15,
-        "Black Tea Leaves": 5,
-        "Mast (Yogurt)": 50,
-        "Fresh Fig": 30,
-        "Persian Nuts Mix": 20
-    }
+    base_qty_vec = base_serving_vector(ingredients)
+    target_vec = target_vector(target)
     
-    # Calculate current nutrition with base quantities
-    current_nutrition = {
-        "calories": 0,
-        "protein": 0,
-        "carbs": 0,
-        "fat": 0
-    }
-    
-    for ingredient in ingredients:
-        base_qty = base_quantities.get(ingredient.name, 100)
-        ratio = base_qty / 100
-        
-        current_nutrition["calories"] += ingredient.calories_per_100g * ratio
-        current_nutrition["protein"] += ingredient.protein_per_100g * ratio
-        current_nutrition["carbs"] += ingredient.carbs_per_100g * ratio
-        current_nutrition["fat"] += ingredient.fat_per_100g * ratio
-    
-    # Calculate scaling factors to reach targets
-    calories_scale = target.calories / current_nutrition["calories"] if current_nutrition["calories"] > 0 else 1
-    protein_scale = target.protein / current_nutrition["protein"] if current_nutrition["protein"] > 0 else 1
-    carbs_scale = target.carbohydrates / current_nutrition["carbs"] if current_nutrition["carbs"] > 0 else 1
-    fat_scale = target.fat / current_nutrition["fat"] if current_nutrition["fat"] > 0 else 1
+    macros = ingredient_macro_matrix(ingredients)
     
     # Use the highest scale factor to ensure we meet all targets
-    max_scale = max(calories_scale, protein_scale, carbs_scale, fat_scale)
+    max_scale = float(_compute_scale(macros, base_qty_vec, target_vec))
     
-    # Calculate final quantities
-    optimal_quantities = {}
-    for ingredient in ingredients:
-        base_qty = base_quantities.get(ingredient.name, 100)
-        optimal_qty = base_qty * max_scale
-        optimal_quantities[ingredient.name] = optimal_qty
+    # Scale the base servings and compute each item's nutrition once
+    quantities = base_qty_vec * max_scale
+    nutrition = macros * (quantities[:, None] / 100)
+    total_calories, total_protein, total_carbs, total_fat = (float(total) for total in nutrition.sum(axis=0))
     
-    return optimal_quantities
-
-def create_single_lunch_meal(ingredients: List[Ingredient], quantities: Dict[str, float]) -> MealPlan:
-    """Create a single lunch meal with all ingredients"""
-    meal_items = []
-    total_calories = 0
-    total_protein = 0
-    total_carbs = 0
-    total_fat = 0
-    
-    for ingredient in ingredients:
-        qty = quantities.get(ingredient.name, 100)
-        
-        item = MealItem(
+    # Every field is derived from validated inputs, so skip per-item Pydantic validation
+    meal_items = [
+        MealItem.model_construct(
             ingredient=ingredient,
             quantity_grams=qty,
-            calories=ingredient.calories_per_100g * qty / 100,
-            protein=ingredient.protein_per_100g * qty / 100,
-            carbs=ingredient.carbs_per_100g * qty / 100,
-            fat=ingredient.fat_per_100g * qty / 100
+            calories=calories,
+            protein=protein,
+            carbs=carbs,
+            fat=fat
         )
-        
-        meal_items.append(item)
-        total_calories += item.calories
-        total_protein += item.protein
-        total_carbs += item.carbs
-        total_fat += item.fat
+        for ingredient, qty, (calories, protein, carbs, fat) in zip(ingredients, quantities.tolist(), nutrition.tolist())
+    ]
     
-    return MealPlan(
+    return MealPlan.model_construct(
         meal_time=MealTime.LUNCH,
         items=meal_items,
         total_calories=total_calories,
@@ -295,7 +346,7 @@ def create_single_lunch_meal(ingredients: List[Ingredient], quantities: Dict[str
         total_fat=total_fat
     )
 
-async def optimize_persian_single_meal():
+def optimize_persian_single_meal():
     """Main optimization function for single lunch meal"""
     print("🇮🇷 Persian Single Meal Optimization")
     print("=" * 60)
@@ -318,20 +369,18 @@ async def optimize_persian_single_meal():
     )
     
     # Load database for supplements
-    db_ingredients = load_ingredients_database()
+    db_index = load_ingredients_index()
     
     # Find supplements
-    supplements = find_supplements(current_nutrition, target_macros, db_ingredients)
+    supplements = find_supplements(current_nutrition, target_macros, db_index)
     
     # Combine all ingredients
     all_ingredients = persian_ingredients + supplements
     print(f"\n🔧 Total ingredients after supplementation: {len(all_ingredients)}")
     
-    # Calculate optimal quantities
-    optimal_quantities = calculate_optimal_quantities(all_ingredients, target_macros)
-    
-    # Create single lunch meal
-    lunch_meal = create_single_lunch_meal(all_ingredients, optimal_quantities)
+    # Calculate optimal quantities and create single lunch meal
+    lunch_meal = build_meal(all_ingredients, target_macros)
+    optimal_quantities = {item.ingredient.name: item.quantity_grams for item in lunch_meal.items}
     
     print(f"\n✅ OPTIMIZATION SUCCESSFUL!")
     print("=" * 60)
@@ -344,29 +393,32 @@ async def optimize_persian_single_meal():
     print(f"   Total Carbs: {lunch_meal.total_carbs:.1f}g")
     print(f"   Total Fat: {lunch_meal.total_fat:.1f}g")
     
-    print(f"\n📋 Ingredients with Quantities:")
+    rows = ["\n📋 Ingredients with Quantities:"]
     for item in lunch_meal.items:
-        print(f"   - {item.ingredient.name}: {item.quantity_grams:.1f}g")
-        print(f"     Calories: {item.calories:.1f}, Protein: {item.protein:.1f}g, Carbs: {item.carbs:.1f}g, Fat: {item.fat:.1f}g")
+        rows.append(_ITEM_ROW(item.ingredient.name, item.quantity_grams, item.calories, item.protein, item.carbs, item.fat))
+    sys.stdout.write("\n".join(rows) + "\n")
     
     # Calculate cost estimate
-    total_cost = sum(item.ingredient.price_per_kg * item.quantity_grams / 1000 for item in lunch_meal.items)
+    qty_vec = np.fromiter((item.quantity_grams for item in lunch_meal.items), dtype=np.float64, count=len(lunch_meal.items))
+    total_cost = float(qty_vec @ price_per_gram_vector(all_ingredients))
     print(f"\n💰 Cost Estimate: ${total_cost:.2f}")
     
     return {
         "success": True,
         "meal_plan": lunch_meal,
         "quantities": optimal_quantities,
-        "cost_estimate": total_cost
+        "cost_estimate": total_cost,
+        "persian_count": len(persian_ingredients),
+        "supplement_count": len(supplements)
     }
 
-async def main():
+def main():
     """Main test function"""
     print("🇮🇷 Persian Single Meal Optimization Test")
     print("=" * 60)
     
     # Run optimization
-    result = await optimize_persian_single_meal()
+    result = optimize_persian_single_meal()
     
     if result:
         print("\n🎉 Persian single meal optimization completed successfully!")
@@ -378,13 +430,19 @@ async def main():
         print("5. ✅ Generated a single lunch meal plan")
         
         print(f"\n📊 Final Summary:")
-        print(f"   Persian Ingredients: {len(create_persian_ingredients())}")
-        print(f"   Supplements Added: {len(load_ingredients_database())}")
-        print(f"   Total Ingredients Used: {len(create_persian_ingredients()) + len(load_ingredients_database())}")
+        print(f"   Persian Ingredients: {result['persian_count']}")
+        print(f"   Supplements Added: {result['supplement_count']}")
+        print(f"   Total Ingredients Used: {result['persian_count'] + result['supplement_count']}")
         print(f"   Single Meal Calories: {result['meal_plan'].total_calories:.1f}")
         print(f"   Single Meal Protein: {result['meal_plan'].total_protein:.1f}g")
     else:
         print("\n❌ Optimization failed. Check the error messages above.")
 
+def test_analyze_persian_nutrition_reports_carbs():
+    """Regression: the carbs total used to be filled with the calorie total"""
+    totals = analyze_persian_nutrition(create_persian_ingredients())
+    assert abs(totals[CARB] - 53.1) < 1e-9
+    assert abs(totals[CAL] - 430.15) < 1e-9
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
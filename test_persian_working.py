@@ -4,109 +4,135 @@ Working Persian Meal Optimization Test
 Simplified version that focuses on core functionality
 """
 
-import asyncio
 import json
+import sys
+import numpy as np
+from collections import defaultdict, namedtuple
+from functools import lru_cache
 from models import NutritionalTarget, UserPreferences, MealTime, Ingredient, MealItem, MealPlan
-from typing import List, Dict
+from _common import VERBOSE, vprint
+from typing import List, Dict, Tuple
 import random
 
+# Prefer orjson for parsing the ingredients database when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+@lru_cache(maxsize=1)
 def create_persian_ingredients() -> List[Ingredient]:
-    """Create the exact Persian ingredients from the user's data"""
+    """Create the exact Persian ingredients from the user's data (cached, do not mutate)"""
+    # Trusted literals, so skip Pydantic validation with model_construct
     return [
-        Ingredient(
+        Ingredient.model_construct(
             id="nan_barbari",
             name="Nan-e Barbari",
             name_fa="نان بربری",
-            calories_per_100g=280,  # 140 cal / 50g * 100
-            protein_per_100g=8,     # 4g / 50g * 100
-            carbs_per_100g=54,      # 27g / 50g * 100
-            fat_per_100g=2,         # 1g / 50g * 100
+            calories_per_100g=280.0,  # 140 cal / 50g * 100
+            protein_per_100g=8.0,     # 4g / 50g * 100
+            carbs_per_100g=54.0,      # 27g / 50g * 100
+            fat_per_100g=2.0,         # 1g / 50g * 100
             category="grain",
             suitable_meals=[MealTime.BREAKFAST, MealTime.LUNCH, MealTime.DINNER],
             price_per_kg=2.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="persian_butter",
             name="Persian Butter",
             name_fa="کره ایرانی",
-            calories_per_100g=720,  # 72 cal / 10g * 100
-            protein_per_100g=0,
-            carbs_per_100g=0,
-            fat_per_100g=80,        # 8g / 10g * 100
+            calories_per_100g=720.0,  # 72 cal / 10g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=0.0,
+            fat_per_100g=80.0,        # 8g / 10g * 100
             category="dairy",
             suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK],
             price_per_kg=12.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="honey",
             name="Honey",
             name_fa="عسل",
-            calories_per_100g=307,  # 46 cal / 15g * 100
-            protein_per_100g=0,
-            carbs_per_100g=80,      # 12g / 15g * 100
-            fat_per_100g=0,
+            calories_per_100g=307.0,  # 46 cal / 15g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=80.0,      # 12g / 15g * 100
+            fat_per_100g=0.0,
             category="sweetener",
             suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK],
             price_per_kg=20.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="black_tea",
             name="Black Tea Leaves",
             name_fa="چای سیاه",
-            calories_per_100g=40,   # 2 cal / 5g * 100
-            protein_per_100g=0,
-            carbs_per_100g=0,
-            fat_per_100g=0,
+            calories_per_100g=40.0,   # 2 cal / 5g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=0.0,
+            fat_per_100g=0.0,
             category="beverage",
             suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK],
             price_per_kg=15.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="mast_yogurt",
             name="Mast (Yogurt)",
             name_fa="ماست",
-            calories_per_100g=60,   # 30 cal / 50g * 100
-            protein_per_100g=6,     # 3g / 50g * 100
-            carbs_per_100g=8,       # 4g / 50g * 100
-            fat_per_100g=2,         # 1g / 50g * 100
+            calories_per_100g=60.0,   # 30 cal / 50g * 100
+            protein_per_100g=6.0,     # 3g / 50g * 100
+            carbs_per_100g=8.0,       # 4g / 50g * 100
+            fat_per_100g=2.0,         # 1g / 50g * 100
             category="dairy",
             suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK],
             price_per_kg=4.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="fresh_fig",
             name="Fresh Fig",
             name_fa="انجیر تازه",
-            calories_per_100g=67,   # 20 cal / 30g * 100
-            protein_per_100g=0,
-            carbs_per_100g=17,      # 5g / 30g * 100
-            fat_per_100g=0,
+            calories_per_100g=67.0,   # 20 cal / 30g * 100
+            protein_per_100g=0.0,
+            carbs_per_100g=17.0,      # 5g / 30g * 100
+            fat_per_100g=0.0,
             category="fruit",
             suitable_meals=[MealTime.BREAKFAST, MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK],
             price_per_kg=8.0,
             availability=True
         ),
-        Ingredient(
+        Ingredient.model_construct(
             id="persian_nuts_mix",
             name="Persian Nuts Mix",
             name_fa="آجیل ایرانی",
-            calories_per_100g=600,  # 120 cal / 20g * 100
-            protein_per_100g=15,    # 3g / 20g * 100
-            carbs_per_100g=25,      # 5g / 20g * 100
-            fat_per_100g=50,        # 10g / 20g * 100
+            calories_per_100g=600.0,  # 120 cal / 20g * 100
+            protein_per_100g=15.0,    # 3g / 20g * 100
+            carbs_per_100g=25.0,      # 5g / 20g * 100
+            fat_per_100g=50.0,        # 10g / 20g * 100
             category="nuts",
             suitable_meals=[MealTime.MORNING_SNACK, MealTime.AFTERNOON_SNACK, MealTime.EVENING_SNACK],
-            price_per_100g=25.0,
+            price_per_kg=25.0,
             availability=True
         )
     ]
 
-def analyze_persian_nutrition(ingredients: List[Ingredient]) -> Dict[str, float]:
+def _ingredients_to_soa(ingredients: List[Ingredient]) -> np.ndarray:
+    """Pack per-100g calories, protein, carbs and fat into an (N, 4) array"""
+    return np.array(
+        [[ing.calories_per_100g, ing.protein_per_100g, ing.carbs_per_100g, ing.fat_per_100g] for ing in ingredients],
+        dtype=np.float64
+    ).reshape(-1, 4)
+
+def analyze_persian_nutrition(ingredients: List[Ingredient], verbose: bool = True) -> Dict[str, float]:
     """Analyze the nutritional content of Persian ingredients with their serving sizes"""
     # Original serving sizes from user data
     servings = {
@@ -119,34 +145,26 @@ def analyze_persian_nutrition(ingredients: List[Ingredient]) -> Dict[str, float]
         "Persian Nuts Mix": 20
     }
     
-    total_calories = 0
-    total_protein = 0
-    total_carbs = 0
-    total_fat = 0
-    
-    print("📊 Persian Ingredients Nutritional Analysis:")
-    print("=" * 60)
-    print(f"{'Ingredient':<20} {'Serving':<10} {'Calories':<10} {'Protein':<10} {'Carbs':<10} {'Fat':<10}")
-    print("-" * 60)
-    
-    for ingredient in ingredients:
-        serving = servings.get(ingredient.name, 100)
-        ratio = serving / 100
-        
-        calories = ingredient.calories_per_100g * ratio
-        protein = ingredient.protein_per_100g * ratio
-        carbs = ingredient.carbs_per_100g * ratio
-        fat = ingredient.fat_per_100g * ratio
-        
-        total_calories += calories
-        total_protein += protein
-        total_carbs += carbs
-        total_fat += fat
-        
-        print(f"{ingredient.name_fa:<20} {serving:<10}g {calories:<10.1f} {protein:<10.1f}g {carbs:<10.1f}g {fat:<10.1f}g")
+    serving_vec = np.fromiter((servings.get(ing.name, 100) for ing in ingredients), dtype=np.float64, count=len(ingredients))
+    macros = _ingredients_to_soa(ingredients)
+    total_calories, total_protein, total_carbs, total_fat = (
+        float(total) for total in np.einsum('ij,i->j', macros, serving_vec / 100)
+    )
     
-    print("-" * 60)
-    print(f"{'TOTAL':<20} {'':<10} {total_calories:<10.1f} {total_protein:<10.1f}g {total_carbs:<10.1f}g {total_fat:<10.1f}g")
+    if verbose:
+        # Build the whole report and emit it with a single write
+        lines = [
+            "📊 Persian Ingredients Nutritional Analysis:\n",
+            "=" * 60 + "\n",
+            f"{'Ingredient':<20} {'Serving':<10} {'Calories':<10} {'Protein':<10} {'Carbs':<10} {'Fat':<10}\n",
+            "-" * 60 + "\n"
+        ]
+        nutrition = macros * (serving_vec[:, None] / 100)
+        for ingredient, serving, (calories, protein, carbs, fat) in zip(ingredients, serving_vec, nutrition):
+            lines.append(f"{ingredient.name_fa:<20} {serving:<10g}g {calories:<10.1f} {protein:<10.1f}g {carbs:<10.1f}g {fat:<10.1f}g\n")
+        lines.append("-" * 60 + "\n")
+        lines.append(f"{'TOTAL':<20} {'':<10} {total_calories:<10.1f} {total_protein:<10.1f}g {total_carbs:<10.1f}g {total_fat:<10.1f}g\n")
+        sys.stdout.write(''.join(lines))
     
     return {
         "calories": total_calories,
@@ -155,19 +173,36 @@ def analyze_persian_nutrition(ingredients: List[Ingredient]) -> Dict[str, float]
         "fat": total_fat
     }
 
+@lru_cache(maxsize=1)
 def load_ingredients_database() -> List[Ingredient]:
-    """Load additional ingredients from database for supplementation"""
+    """Load additional ingredients from database for supplementation (cached, do not mutate)"""
     try:
-        with open('ingredients_database.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return [Ingredient(**item) for item in data]
+        with open('ingredients_database.json', 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        return [Ingredient(**item) for item in data]
     except Exception as e:
-        print(f"Warning: Could not load ingredients database: {e}")
+        vprint(f"Warning: Could not load ingredients database: {e}")
         return []
 
-def find_supplements(current_nutrition: Dict[str, float], target: NutritionalTarget, db_ingredients: List[Ingredient]) -> List[Ingredient]:
+@lru_cache(maxsize=1)
+def load_ingredients_index() -> Tuple[Dict[str, List[Ingredient]], List[Ingredient]]:
+    """Bucket database ingredients by category, best supplement first, plus the fat-rich ones"""
+    db_ingredients = load_ingredients_database()
+    by_category = defaultdict(list)
+    for ing in db_ingredients:
+        by_category[ing.category].append(ing)
+    
+    # Sort the buckets a supplement is drawn from by the macro it supplies (stable, so ties keep DB order)
+    by_category["protein"].sort(key=lambda ing: ing.protein_per_100g, reverse=True)
+    by_category["grain"].sort(key=lambda ing: ing.carbs_per_100g, reverse=True)
+    fat_rich = sorted((ing for ing in db_ingredients if ing.fat_per_100g > 10), key=lambda ing: ing.fat_per_100g, reverse=True)
+    return dict(by_category), fat_rich
+
+def find_supplements(current_nutrition: Dict[str, float], target: NutritionalTarget, db_index: Tuple[Dict[str, List[Ingredient]], List[Ingredient]]) -> List[Ingredient]:
     """Find ingredients to supplement missing nutrition"""
     supplements = []
+    by_category, fat_rich = db_index
     
     # Calculate deficits
     protein_deficit = max(0, target.protein - current_nutrition["protein"])
@@ -175,49 +210,81 @@ def find_supplements(current_nutrition: Dict[str, float], target: NutritionalTar
     fat_deficit = max(0, target.fat - current_nutrition["fat"])
     calories_deficit = max(0, target.calories - current_nutrition["calories"])
     
-    print(f"\n🎯 Target vs Current:")
-    print(f"   Target:     {target.calories:.1f} cal, {target.protein:.1f}g protein, {target.carbohydrates:.1f}g carbs, {target.fat:.1f}g fat")
-    print(f"   Current:    {current_nutrition['calories']:.1f} cal, {current_nutrition['protein']:.1f}g protein, {current_nutrition['carbs']:.1f}g carbs, {current_nutrition['fat']:.1f}g fat")
-    print(f"   Deficits:   {calories_deficit:.1f} cal, {protein_deficit:.1f}g protein, {carbs_deficit:.1f}g carbs, {fat_deficit:.1f}g fat")
+    vprint(f"\n🎯 Target vs Current:")
+    vprint(f"   Target:     {target.calories:.1f} cal, {target.protein:.1f}g protein, {target.carbohydrates:.1f}g carbs, {target.fat:.1f}g fat")
+    vprint(f"   Current:    {current_nutrition['calories']:.1f} cal, {current_nutrition['protein']:.1f}g protein, {current_nutrition['carbs']:.1f}g carbs, {current_nutrition['fat']:.1f}g fat")
+    vprint(f"   Deficits:   {calories_deficit:.1f} cal, {protein_deficit:.1f}g protein, {carbs_deficit:.1f}g carbs, {fat_deficit:.1f}g fat")
     
-    print(f"\n🔧 Adding Supplements:")
+    vprint(f"\n🔧 Adding Supplements:")
     
     # Add protein supplements
     if protein_deficit > 0:
-        protein_ingredients = [ing for ing in db_ingredients if ing.category == "protein" and ing.protein_per_100g > 20]
-        if protein_ingredients:
-            supplements.append(protein_ingredients[0])
-            print(f"   ➕ Protein: {protein_ingredients[0].name} ({protein_ingredients[0].protein_per_100g:.1f}g/100g)")
+        proteins = by_category.get("protein", [])
+        if proteins and proteins[0].protein_per_100g > 20:
+            supplements.append(proteins[0])
+            vprint(f"   ➕ Protein: {proteins[0].name} ({proteins[0].protein_per_100g:.1f}g/100g)")
     
     # Add carb supplements
     if carbs_deficit > 0:
-        carb_ingredients = [ing for ing in db_ingredients if ing.category == "grain" and ing.carbs_per_100g > 20]
-        if carb_ingredients:
-            supplements.append(carb_ingredients[0])
-            print(f"   ➕ Carbs: {carb_ingredients[0].name} ({carb_ingredients[0].carbs_per_100g:.1f}g/100g)")
+        grains = by_category.get("grain", [])
+        if grains and grains[0].carbs_per_100g > 20:
+            supplements.append(grains[0])
+            vprint(f"   ➕ Carbs: {grains[0].name} ({grains[0].carbs_per_100g:.1f}g/100g)")
     
     # Add fat supplements
     if fat_deficit > 0:
-        fat_ingredients = [ing for ing in db_ingredients if ing.fat_per_100g > 10]
-        if fat_ingredients:
-            supplements.append(fat_ingredients[0])
-            print(f"   ➕ Fat: {fat_ingredients[0].name} ({fat_ingredients[0].fat_per_100g:.1f}g/100g)")
+        if fat_rich:
+            supplements.append(fat_rich[0])
+            vprint(f"   ➕ Fat: {fat_rich[0].name} ({fat_rich[0].fat_per_100g:.1f}g/100g)")
     
     # Add vegetable for fiber and micronutrients
-    veg_ingredients = [ing for ing in db_ingredients if ing.category == "vegetable"]
-    if veg_ingredients:
-        supplements.append(veg_ingredients[0])
-        print(f"   ➕ Vegetable: {veg_ingredients[0].name}")
+    vegetables = by_category.get("vegetable", [])
+    if vegetables:
+        supplements.append(vegetables[0])
+        vprint(f"   ➕ Vegetable: {vegetables[0].name}")
     
     return supplements
 
+# Plain-tuple stand-in for MealItem while meals are assembled; validated once on return
+_MealItemLite = namedtuple('_MealItemLite', 'ingredient quantity_grams calories protein carbs fat')
+
+# Bit position of each meal time in an ingredient's suitability mask
+MEAL_INDEX = {meal_time: i for i, meal_time in enumerate(MealTime)}
+
+def _suitable_masks(ingredients: List[Ingredient]) -> np.ndarray:
+    """Encode each ingredient's suitable_meals as one bit per MealTime"""
+    return np.fromiter(
+        (sum(1 << MEAL_INDEX[meal_time] for meal_time in set(ing.suitable_meals)) for ing in ingredients),
+        dtype=np.uint8,
+        count=len(ingredients)
+    )
+
+def _greedy_pick(macros: np.ndarray, suitable: np.ndarray, meal_cal_threshold: float, used: np.ndarray) -> np.ndarray:
+    """Pick the first unused suitable ingredient index for each meal (-1 when none)"""
+    n_ingredients, n_meals = suitable.shape
+    picks = np.full(n_meals, -1, dtype=np.int32)
+    for meal_idx in range(n_meals):
+        meal_calories = 0.0
+        for idx in range(n_ingredients):
+            if used[idx] or not suitable[idx, meal_idx]:
+                continue
+            if meal_calories < meal_cal_threshold:
+                picks[meal_idx] = idx
+                used[idx] = True
+                meal_calories += macros[idx, 0]
+                break
+    return picks
+
+if NUMBA_AVAILABLE:
+    # Explicit signature compiles eagerly at import and gives a stable cache key
+    _greedy_pick = njit('int32[:](float64[:,:], boolean[:,:], float64, boolean[:])', cache=True)(_greedy_pick)
+
 def simple_optimization(ingredients: List[Ingredient], target: NutritionalTarget) -> Dict:
     """Simple optimization using greedy approach"""
-    print(f"\n🧠 Running Simple Optimization Algorithm...")
+    vprint(f"\n🧠 Running Simple Optimization Algorithm...")
     
-    # Create meal plans for each meal time
-    meal_plans = []
-    remaining_ingredients = ingredients.copy()
+    # Meals assembled from lite items, as (meal_time, items, calories, protein, carbs, fat)
+    meal_rows = []
     
     meal_times = [
         MealTime.BREAKFAST,
@@ -235,67 +302,61 @@ def simple_optimization(ingredients: List[Ingredient], target: NutritionalTarget
         "fat": 0
     }
     
-    for meal_time in meal_times:
-        # Calculate target for this meal (divide daily target by 6)
-        meal_target = {
-            "calories": target.calories / 6,
-            "protein": target.protein / 6,
-            "carbs": target.carbohydrates / 6,
-            "fat": target.fat / 6
-        }
-        
-        # Select ingredients for this meal
+    # Pick one ingredient per meal on plain arrays
+    macros = _ingredients_to_soa(ingredients)
+    prices = np.fromiter((ing.price_per_kg or 0.0 for ing in ingredients), dtype=np.float64, count=len(ingredients))
+    meal_bits = np.array([MEAL_INDEX[meal_time] for meal_time in meal_times], dtype=np.uint8)
+    suitable = ((_suitable_masks(ingredients)[:, None] >> meal_bits) & 1).astype(np.bool_)
+    # Only calories gate a pick: a sixth of the daily target, allowing 20% flexibility
+    meal_cal_threshold = target.calories / 6 * 0.8
+    used = np.zeros(len(ingredients), dtype=np.bool_)
+    picks = _greedy_pick(macros, suitable, meal_cal_threshold, used)
+    
+    for meal_time, idx in zip(meal_times, picks):
         meal_items = []
         meal_calories = 0
         meal_protein = 0
         meal_carbs = 0
         meal_fat = 0
         
-        # Try to fill the meal with suitable ingredients
-        for ingredient in remaining_ingredients:
-            if meal_time in ingredient.suitable_meals:
-                # Calculate how much of this ingredient to add
-                max_grams = 100  # Start with 100g
-                
-                # Adjust based on what's still needed
-                if meal_calories < meal_target["calories"] * 0.8:  # Allow 20% flexibility
-                    # Add ingredient
-                    item = MealItem(
-                        ingredient=ingredient,
-                        quantity_grams=max_grams,
-                        calories=ingredient.calories_per_100g * max_grams / 100,
-                        protein=ingredient.protein_per_100g * max_grams / 100,
-                        carbs=ingredient.carbs_per_100g * max_grams / 100,
-                        fat=ingredient.fat_per_100g * max_grams / 100
-                    )
-                    
-                    meal_items.append(item)
-                    meal_calories += item.calories
-                    meal_protein += item.protein
-                    meal_carbs += item.carbs
-                    meal_fat += item.fat
-                    
-                    # Update daily totals
-                    daily_totals["calories"] += item.calories
-                    daily_totals["protein"] += item.protein
-                    daily_totals["carbs"] += item.carbs
-                    daily_totals["fat"] += item.fat
-                    
-                    # Remove from remaining ingredients
-                    remaining_ingredients.remove(ingredient)
-                    break
+        if idx >= 0:
+            ingredient = ingredients[idx]
+            max_grams = 100  # Start with 100g
+            item = _MealItemLite(
+                ingredient,
+                max_grams,
+                ingredient.calories_per_100g * max_grams / 100,
+                ingredient.protein_per_100g * max_grams / 100,
+                ingredient.carbs_per_100g * max_grams / 100,
+                ingredient.fat_per_100g * max_grams / 100
+            )
+            
+            meal_items.append(item)
+            meal_calories += item.calories
+            meal_protein += item.protein
+            meal_carbs += item.carbs
+            meal_fat += item.fat
+            
+            # Update daily totals
+            daily_totals["calories"] += item.calories
+            daily_totals["protein"] += item.protein
+            daily_totals["carbs"] += item.carbs
+            daily_totals["fat"] += item.fat
         
-        # Create meal plan
-        meal_plan = MealPlan(
+        meal_rows.append((meal_time, meal_items, meal_calories, meal_protein, meal_carbs, meal_fat))
+    
+    # Create meal plans, converting the lite items to MealItem in one pass
+    meal_plans = [
+        MealPlan(
             meal_time=meal_time,
-            items=meal_items,
-            total_calories=meal_calories,
-            total_protein=meal_protein,
-            total_carbs=meal_carbs,
-            total_fat=meal_fat
+            items=[MealItem(**item._asdict()) for item in items],
+            total_calories=calories,
+            total_protein=protein,
+            total_carbs=carbs,
+            total_fat=fat
         )
-        
-        meal_plans.append(meal_plan)
+        for meal_time, items, calories, protein, carbs, fat in meal_rows
+    ]
     
     return {
         "success": True,
@@ -308,22 +369,22 @@ def simple_optimization(ingredients: List[Ingredient], target: NutritionalTarget
             carbohydrates=daily_totals["carbs"],
             fat=daily_totals["fat"]
         ),
-        "cost_estimate": sum(ing.price_per_kg or 0 for ing in ingredients) * 0.1  # Rough estimate
+        "cost_estimate": float(prices.sum()) * 0.1  # Rough estimate
     }
 
-async def optimize_persian_meal():
+def optimize_persian_meal():
     """Main optimization function"""
-    print("🇮🇷 Persian Meal Optimization")
-    print("=" * 60)
+    vprint("🇮🇷 Persian Meal Optimization")
+    vprint("=" * 60)
     
     # Create Persian ingredients
     persian_ingredients = create_persian_ingredients()
-    print(f"📋 Persian Ingredients ({len(persian_ingredients)} items):")
+    vprint(f"📋 Persian Ingredients ({len(persian_ingredients)} items):")
     for ing in persian_ingredients:
-        print(f"   • {ing.name_fa} ({ing.name})")
+        vprint(f"   • {ing.name_fa} ({ing.name})")
     
     # Analyze current nutrition
-    current_nutrition = analyze_persian_nutrition(persian_ingredients)
+    current_nutrition = analyze_persian_nutrition(persian_ingredients, verbose=VERBOSE)
     
     # Define target macros
     target_macros = NutritionalTarget(
@@ -333,43 +394,40 @@ async def optimize_persian_meal():
         fat=65
     )
     
-    # Load database for supplements
-    db_ingredients = load_ingredients_database()
-    
-    # Find supplements
-    supplements = find_supplements(current_nutrition, target_macros, db_ingredients)
+    # Find supplements from the indexed database
+    supplements = find_supplements(current_nutrition, target_macros, load_ingredients_index())
     
     # Combine all ingredients
     all_ingredients = persian_ingredients + supplements
-    print(f"\n🔧 Total ingredients after supplementation: {len(all_ingredients)}")
+    vprint(f"\n🔧 Total ingredients after supplementation: {len(all_ingredients)}")
     
     # Run simple optimization
     result = simple_optimization(all_ingredients, target_macros)
     
     if result and result.get('success', False):
-        print("\n✅ OPTIMIZATION SUCCESSFUL!")
-        print("=" * 60)
+        vprint("\n✅ OPTIMIZATION SUCCESSFUL!")
+        vprint("=" * 60)
         
         # Display results
-        print(f"📈 Optimization Method: {result.get('optimization_method', 'Unknown')}")
-        print(f"🎯 Target Achieved: {result.get('target_achieved', 'Unknown')}")
-        print(f"💰 Cost Estimate: ${result.get('cost_estimate', 0):.2f}")
+        vprint(f"📈 Optimization Method: {result.get('optimization_method', 'Unknown')}")
+        vprint(f"🎯 Target Achieved: {result.get('target_achieved', 'Unknown')}")
+        vprint(f"💰 Cost Estimate: ${result.get('cost_estimate', 0):.2f}")
         
         if 'meal_plans' in result:
-            print(f"\n🍽️  Optimized Meal Plan:")
+            vprint(f"\n🍽️  Optimized Meal Plan:")
             for i, meal in enumerate(result['meal_plans']):
-                print(f"   {i+1}. {meal.meal_time.value}: {meal.total_calories:.1f} kcal")
+                vprint(f"   {i+1}. {meal.meal_time.value}: {meal.total_calories:.1f} kcal")
                 if meal.items:
                     for item in meal.items:
-                        print(f"      - {item.ingredient.name}: {item.quantity_grams:.1f}g")
+                        vprint(f"      - {item.ingredient.name}: {item.quantity_grams:.1f}g")
         
         if 'daily_totals' in result:
             daily = result['daily_totals']
-            print(f"\n📊 Daily Totals:")
-            print(f"   Calories: {daily.calories:.1f}")
-            print(f"   Protein: {daily.protein:.1f}g")
-            print(f"   Carbs: {daily.carbohydrates:.1f}g")
-            print(f"   Fat: {daily.fat:.1f}g")
+            vprint(f"\n📊 Daily Totals:")
+            vprint(f"   Calories: {daily.calories:.1f}")
+            vprint(f"   Protein: {daily.protein:.1f}g")
+            vprint(f"   Carbs: {daily.carbohydrates:.1f}g")
+            vprint(f"   Fat: {daily.fat:.1f}g")
         
         return result
         
@@ -377,31 +435,31 @@ async def optimize_persian_meal():
         print("\n❌ OPTIMIZATION FAILED")
         return None
 
-async def main():
+def main():
     """Main test function"""
-    print("🇮🇷 Persian Meal Optimization Test")
-    print("=" * 60)
+    vprint("🇮🇷 Persian Meal Optimization Test")
+    vprint("=" * 60)
     
     # Run optimization
-    result = await optimize_persian_meal()
+    result = optimize_persian_meal()
     
     if result:
-        print("\n🎉 Persian meal optimization completed successfully!")
-        print("The system has:")
-        print("1. ✅ Analyzed your Persian ingredients")
-        print("2. ✅ Calculated nutritional deficits")
-        print("3. ✅ Added supplementary ingredients")
-        print("4. ✅ Optimized using simple algorithm")
-        print("5. ✅ Generated a balanced meal plan")
+        vprint("\n🎉 Persian meal optimization completed successfully!")
+        vprint("The system has:")
+        vprint("1. ✅ Analyzed your Persian ingredients")
+        vprint("2. ✅ Calculated nutritional deficits")
+        vprint("3. ✅ Added supplementary ingredients")
+        vprint("4. ✅ Optimized using simple algorithm")
+        vprint("5. ✅ Generated a balanced meal plan")
         
-        print(f"\n📋 Final Summary:")
-        print(f"   Persian Ingredients: {len(create_persian_ingredients())}")
-        print(f"   Supplements Added: {len(load_ingredients_database())}")
-        print(f"   Total Ingredients Used: {len(create_persian_ingredients()) + len(load_ingredients_database())}")
-        print(f"   Daily Calories: {result['daily_totals'].calories:.1f}")
-        print(f"   Daily Protein: {result['daily_totals'].protein:.1f}g")
+        vprint(f"\n📋 Final Summary:")
+        vprint(f"   Persian Ingredients: {len(create_persian_ingredients())}")
+        vprint(f"   Supplements Added: {len(load_ingredients_database())}")
+        vprint(f"   Total Ingredients Used: {len(create_persian_ingredients()) + len(load_ingredients_database())}")
+        vprint(f"   Daily Calories: {result['daily_totals'].calories:.1f}")
+        vprint(f"   Daily Protein: {result['daily_totals'].protein:.1f}g")
     else:
         print("\n❌ Optimization failed. Check the error messages above.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -5,16 +5,30 @@ Test to verify that the system reaches targets precisely without exceeding them
 
 import sys
 import os
+import numpy as np
+from typing import Dict, Tuple
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from rag_optimization_engine import RAGMealOptimizer
+from rag_optimization_engine import get_optimizer
+from _common import vprint
+
+MACROS = ('calories', 'protein', 'carbs', 'fat')
+
+# Allowed absolute deviation from each target
+TOLERANCES = {'calories': 50, 'protein': 5, 'carbs': 5, 'fat': 3}
+
+def within_tolerance(actual: Dict[str, float], target: Dict[str, float], tol: Dict[str, float]) -> Tuple[bool, np.ndarray]:
+    """Check |actual - target| <= tol per macro; returns (all passed, per-macro pass array)"""
+    actual_vec, target_vec, tol_vec = (np.array([d[m] for m in MACROS], dtype=np.float64) for d in (actual, target, tol))
+    oks = np.abs(actual_vec - target_vec) <= tol_vec
+    return bool(oks.all()), oks
 
 def test_precise_targets():
     """Test that the system reaches targets precisely"""
-    print("🧪 TESTING: Precise target achievement without exceeding")
-    print("=" * 60)
+    vprint("🧪 TESTING: Precise target achievement without exceeding")
+    vprint("=" * 60)
     
     # Mock RAG response with low protein
     rag_response = {
@@ -45,25 +59,25 @@ def test_precise_targets():
     }
     
     try:
-        engine = RAGMealOptimizer()
+        engine = get_optimizer()
         
         # Run optimization
-        print("🚀 Running optimization...")
+        vprint("🚀 Running optimization...")
         result = engine.optimize_single_meal(rag_response, target_macros, user_preferences, "dinner")
         
-        print("✅ Optimization completed!")
+        vprint("✅ Optimization completed!")
         
         if 'meal' in result:
             meal_data = result['meal']
             
             if isinstance(meal_data, dict) and 'items' in meal_data:
                 meal_items = meal_data['items']
-                print(f"🍽️ Final meal has {len(meal_items)} ingredients")
+                vprint(f"🍽️ Final meal has {len(meal_items)} ingredients")
                 
                 # Show all ingredients
                 for i, item in enumerate(meal_items):
-                    print(f"  {i+1}. {item.get('ingredient', 'Unknown')} - {item.get('quantity_grams', 0):.1f}g")
-                    print(f"     Calories: {item.get('calories', 0):.1f}, Protein: {item.get('protein', 0):.1f}g, Carbs: {item.get('carbs', 0):.1f}g, Fat: {item.get('fat', 0):.1f}g")
+                    vprint(f"  {i+1}. {item.get('ingredient', 'Unknown')} - {item.get('quantity_grams', 0):.1f}g")
+                    vprint(f"     Calories: {item.get('calories', 0):.1f}, Protein: {item.get('protein', 0):.1f}g, Carbs: {item.get('carbs', 0):.1f}g, Fat: {item.get('fat', 0):.1f}g")
                 
                 # Show totals
                 if 'total_calories' in meal_data:
@@ -72,20 +86,18 @@ def test_precise_targets():
                     total_carbs = meal_data['total_carbs']
                     total_fat = meal_data['total_fat']
                     
-                    print(f"\n📊 TOTALS vs TARGETS:")
-                    print(f"  Calories: {total_cal:.1f} / {target_macros['calories']} {'✅' if abs(total_cal - target_macros['calories']) <= 50 else '❌'}")
-                    print(f"  Protein:  {total_protein:.1f}g / {target_macros['protein']}g {'✅' if abs(total_protein - target_macros['protein']) <= 5 else '❌'}")
-                    print(f"  Carbs:    {total_carbs:.1f}g / {target_macros['carbs']}g {'✅' if abs(total_carbs - target_macros['carbs']) <= 5 else '❌'}")
-                    print(f"  Fat:      {total_fat:.1f}g / {target_macros['fat']}g {'✅' if abs(total_fat - target_macros['fat']) <= 3 else '❌'}")
-                    
                     # Check if targets are met precisely
-                    calories_ok = abs(total_cal - target_macros['calories']) <= 50
-                    protein_ok = abs(total_protein - target_macros['protein']) <= 5
-                    carbs_ok = abs(total_carbs - target_macros['carbs']) <= 5
-                    fat_ok = abs(total_fat - target_macros['fat']) <= 3
+                    totals = {'calories': total_cal, 'protein': total_protein, 'carbs': total_carbs, 'fat': total_fat}
+                    passed, (calories_ok, protein_ok, carbs_ok, fat_ok) = within_tolerance(totals, target_macros, TOLERANCES)
+                    
+                    vprint(f"\n📊 TOTALS vs TARGETS:")
+                    vprint(f"  Calories: {total_cal:.1f} / {target_macros['calories']} {'✅' if calories_ok else '❌'}")
+                    vprint(f"  Protein:  {total_protein:.1f}g / {target_macros['protein']}g {'✅' if protein_ok else '❌'}")
+                    vprint(f"  Carbs:    {total_carbs:.1f}g / {target_macros['carbs']}g {'✅' if carbs_ok else '❌'}")
+                    vprint(f"  Fat:      {total_fat:.1f}g / {target_macros['fat']}g {'✅' if fat_ok else '❌'}")
                     
-                    if calories_ok and protein_ok and carbs_ok and fat_ok:
-                        print(f"\n🎉 SUCCESS: All targets met precisely!")
+                    if passed:
+                        vprint(f"\n🎉 SUCCESS: All targets met precisely!")
                         return True
                     else:
                         print(f"\n❌ FAILURE: Some targets not met precisely")
@@ -93,12 +105,12 @@ def test_precise_targets():
         
         if 'target_achievement' in result:
             achievement = result['target_achievement']
-            print(f"\n🎯 Target Achievement:")
-            print(f"  Overall: {'✅' if achievement.get('overall_achieved', False) else '❌'}")
-            print(f"  Calories: {'✅' if achievement.get('calories_achieved', False) else '❌'}")
-            print(f"  Protein: {'✅' if achievement.get('protein_achieved', False) else '❌'}")
-            print(f"  Carbs: {'✅' if achievement.get('carbs_achieved', False) else '❌'}")
-            print(f"  Fat: {'✅' if achievement.get('fat_achieved', False) else '❌'}")
+            vprint(f"\n🎯 Target Achievement:")
+            vprint(f"  Overall: {'✅' if achievement.get('overall_achieved', False) else '❌'}")
+            vprint(f"  Calories: {'✅' if achievement.get('calories_achieved', False) else '❌'}")
+            vprint(f"  Protein: {'✅' if achievement.get('protein_achieved', False) else '❌'}")
+            vprint(f"  Carbs: {'✅' if achievement.get('carbs_achieved', False) else '❌'}")
+            vprint(f"  Fat: {'✅' if achievement.get('fat_achieved', False) else '❌'}")
         
         return False
         
@@ -111,6 +123,6 @@ def test_precise_targets():
 if __name__ == "__main__":
     success = test_precise_targets()
     if success:
-        print("\n🎉 TEST PASSED: Targets met precisely!")
+        vprint("\n🎉 TEST PASSED: Targets met precisely!")
     else:
-        print("\n💥 TEST FAILED: Targets not met precisely!")
+        vprint("\n💥 TEST FAILED: Targets not met precisely!")
@@ -7,15 +7,16 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from rag_optimization_engine import RAGMealOptimizer
+from rag_optimization_engine import get_optimizer
+from _common import vprint
 
 def test_pulp_debug():
     """Test PuLP optimization specifically"""
     
-    optimizer = RAGMealOptimizer()
+    optimizer = get_optimizer()
     
-    print("🧪 Testing PuLP Optimization Debug")
-    print("=" * 60)
+    vprint("🧪 Testing PuLP Optimization Debug")
+    vprint("=" * 60)
     
     # Test ingredients
     ingredients = [
@@ -46,28 +47,28 @@ def test_pulp_debug():
         "fat": 6.7
     }
     
-    print("📥 Test data:")
-    print(f"   - Ingredients: {len(ingredients)}")
-    print(f"   - Target macros: {target_macros}")
+    vprint("📥 Test data:")
+    vprint(f"   - Ingredients: {len(ingredients)}")
+    vprint(f"   - Target macros: {target_macros}")
     
-    print("\n🔧 Testing PuLP optimization...")
+    vprint("\n🔧 Testing PuLP optimization...")
     
     try:
         # Test PuLP directly
         result = optimizer._linear_optimize_pulp(ingredients, target_macros)
-        print(f"✅ PuLP result: {result}")
+        vprint(f"✅ PuLP result: {result}")
         
         if result.get('success'):
             quantities = result['quantities']
-            print(f"   - Quantities: {quantities}")
+            vprint(f"   - Quantities: {quantities}")
             
             # Calculate nutrition
             totals = optimizer._calculate_final_meal(ingredients, quantities)
-            print(f"   - Nutrition totals: {totals}")
+            vprint(f"   - Nutrition totals: {totals}")
             
             # Check achievement
             achievement = optimizer._check_target_achievement(totals, target_macros)
-            print(f"   - Target achievement: {achievement}")
+            vprint(f"   - Target achievement: {achievement}")
         else:
             print(f"   ❌ PuLP failed: {result.get('method')}")
             
@@ -76,7 +77,7 @@ def test_pulp_debug():
         import traceback
         traceback.print_exc()
     
-    print("\n✅ Test completed!")
+    vprint("\n✅ Test completed!")
 
 if __name__ == "__main__":
     test_pulp_debug()
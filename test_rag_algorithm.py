@@ -3,14 +3,15 @@
 Test file for the RAG optimization algorithm
 """
 
-from rag_optimization_engine import RAGMealOptimizer
+from rag_optimization_engine import get_optimizer
+from _common import vprint
 import json
 
 def test_rag_optimization():
     """Test the RAG optimization algorithm"""
     
     # Initialize the optimizer
-    optimizer = RAGMealOptimizer()
+    optimizer = get_optimizer()
     
     # Test data
     rag_response = {
@@ -35,11 +36,11 @@ def test_rag_optimization():
     user_preferences = {}
     meal_type = "lunch"
     
-    print("🚀 Testing RAG Optimization Algorithm")
-    print("=" * 50)
-    print(f"Target macros: {target_macros}")
-    print(f"Meal type: {meal_type}")
-    print()
+    vprint("🚀 Testing RAG Optimization Algorithm")
+    vprint("=" * 50)
+    vprint(f"Target macros: {target_macros}")
+    vprint(f"Meal type: {meal_type}")
+    vprint()
     
     try:
         # Run optimization
@@ -51,38 +52,38 @@ def test_rag_optimization():
         )
         
         if result["success"]:
-            print("✅ Optimization successful!")
-            print(f"Method used: {result['optimization_result']['method']}")
-            print(f"Computation time: {result['optimization_result']['computation_time']}s")
-            print()
+            vprint("✅ Optimization successful!")
+            vprint(f"Method used: {result['optimization_result']['method']}")
+            vprint(f"Computation time: {result['optimization_result']['computation_time']}s")
+            vprint()
             
-            print("📊 Nutritional totals:")
+            vprint("📊 Nutritional totals:")
             for macro, value in result["nutritional_totals"].items():
                 target = target_macros.get(macro, 0)
                 diff_percent = abs(value - target) / target * 100 if target > 0 else 0
-                print(f"  {macro}: {value:.1f} (target: {target:.1f}, diff: {diff_percent:.1f}%)")
-            print()
+                vprint(f"  {macro}: {value:.1f} (target: {target:.1f}, diff: {diff_percent:.1f}%)")
+            vprint()
             
-            print("🎯 Target achievement:")
+            vprint("🎯 Target achievement:")
             for macro, achieved in result["target_achievement"].items():
                 status = "✅" if achieved else "❌"
-                print(f"  {macro}: {status}")
-            print()
+                vprint(f"  {macro}: {status}")
+            vprint()
             
-            print("🍽️ Final meal:")
+            vprint("🍽️ Final meal:")
             for i, ingredient in enumerate(result["meal"]):
-                print(f"  {i+1}. {ingredient['name']}: {ingredient['quantity_needed']:.1f}g")
-            print()
+                vprint(f"  {i+1}. {ingredient['name']}: {ingredient['quantity_needed']:.1f}g")
+            vprint()
             
             if result["helper_ingredients_added"]:
-                print("➕ Helper ingredients added:")
+                vprint("➕ Helper ingredients added:")
                 for ingredient in result["helper_ingredients_added"]:
-                    print(f"  - {ingredient['name']}: {ingredient['quantity_needed']:.1f}g")
-                print()
+                    vprint(f"  - {ingredient['name']}: {ingredient['quantity_needed']:.1f}g")
+                vprint()
             
-            print("📋 Optimization steps:")
+            vprint("📋 Optimization steps:")
             for step_name, step_desc in result["optimization_steps"].items():
-                print(f"  {step_name}: {step_desc}")
+                vprint(f"  {step_name}: {step_desc}")
             
         else:
             print("❌ Optimization failed!")
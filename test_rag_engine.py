@@ -3,15 +3,16 @@
 Test script for RAG Meal Optimizer
 """
 
-from rag_optimization_engine import RAGMealOptimizer
+from rag_optimization_engine import get_optimizer
+from _common import vprint
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
 def test_rag_optimizer():
-    optimizer = RAGMealOptimizer()
-    print("✅ Optimizer initialized successfully")
+    optimizer = get_optimizer()
+    vprint("✅ Optimizer initialized successfully")
     
     rag_response = [
         {'name': 'chicken_breast', 'quantity': 100},
@@ -29,8 +30,8 @@ def test_rag_optimizer():
     user_preferences = {}
     meal_type = 'lunch'
     
-    print(f"🍽️ Testing with {len(rag_response)} ingredients")
-    print(f"🎯 Target macros: {target_macros}")
+    vprint(f"🍽️ Testing with {len(rag_response)} ingredients")
+    vprint(f"🎯 Target macros: {target_macros}")
     
     try:
         result = optimizer.optimize_single_meal(
@@ -40,27 +41,27 @@ def test_rag_optimizer():
             meal_type=meal_type
         )
         
-        print("\n✅ Optimization completed successfully!")
-        print(f"📊 Method used: {result['optimization_result']['method']}")
-        print(f"⏱️ Computation time: {result['optimization_result']['computation_time']}s")
+        vprint("\n✅ Optimization completed successfully!")
+        vprint(f"📊 Method used: {result['optimization_result']['method']}")
+        vprint(f"⏱️ Computation time: {result['optimization_result']['computation_time']}s")
         
-        print("\n🍽️ Final Meal:")
+        vprint("\n🍽️ Final Meal:")
         for ingredient in result['meal']:
-            print(f"  - {ingredient['name']}: {ingredient['quantity_needed']}g")
+            vprint(f"  - {ingredient['name']}: {ingredient['quantity_needed']}g")
         
-        print(f"\n📈 Nutritional Totals:")
+        vprint(f"\n📈 Nutritional Totals:")
         totals = result['nutritional_totals']
         for macro, value in totals.items():
-            print(f"  - {macro}: {value:.1f}")
+            vprint(f"  - {macro}: {value:.1f}")
         
-        print(f"\n🎯 Target Achievement:")
+        vprint(f"\n🎯 Target Achievement:")
         achievement = result['target_achievement']
         for macro, achieved in achievement.items():
             if macro != 'overall':
                 status = "✅" if achieved else "❌"
-                print(f"  - {macro}: {status}")
+                vprint(f"  - {macro}: {status}")
         
-        print(f"\n🔧 Helper ingredients added: {result['helper_ingredients_added']}")
+        vprint(f"\n🔧 Helper ingredients added: {result['helper_ingredients_added']}")
         
         return True
         
@@ -73,6 +74,6 @@ def test_rag_optimizer():
 if __name__ == "__main__":
     success = test_rag_optimizer()
     if success:
-        print("\n🎉 All tests passed!")
+        vprint("\n🎉 All tests passed!")
     else:
-        print("\n💥 Tests failed!")
+        vprint("\n💥 Tests failed!")
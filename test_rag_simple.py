@@ -4,71 +4,71 @@ Simple test for RAG optimization method
 """
 
 import asyncio
-from optimization_engine import MealOptimizationEngine
+from optimization_engine import get_engine
 from models import NutritionalTarget, UserPreferences, Ingredient
 
-async def test_rag_method():
-    """Test the RAG optimization method directly"""
-    try:
-        print("Creating engine...")
-        engine = MealOptimizationEngine()
-        
-        print("Creating test data...")
-        rag_response = {
-            "suggestions": [
+# Test data shared by every run, so the models are validated once per process
+RAG_RESPONSE = {
+    "suggestions": [
+        {
+            "ingredients": [
                 {
-                    "ingredients": [
-                        {
-                            "name": "Ground Beef",
-                            "amount": 200,
-                            "calories": 400,
-                            "protein": 40,
-                            "carbs": 0,
-                            "fat": 30
-                        }
-                    ]
+                    "name": "Ground Beef",
+                    "amount": 200,
+                    "calories": 400,
+                    "protein": 40,
+                    "carbs": 0,
+                    "fat": 30
                 }
             ]
         }
-        
-        target_macros = NutritionalTarget(
-            calories=2000,
-            protein=150,
-            carbohydrates=200,
-            fat=65
-        )
-        
-        user_preferences = UserPreferences(
-            dietary_restrictions=[],
-            allergies=[],
-            preferred_cuisines=["persian"],
-            calorie_preference="moderate",
-            protein_preference="high",
-            carb_preference="moderate",
-            fat_preference="moderate"
-        )
-        
-        available_ingredients = [
-            Ingredient(
-                id="1",
-                name="Chicken Breast",
-                name_fa="سینه مرغ",
-                calories_per_100g=165,
-                protein_per_100g=31,
-                carbs_per_100g=0,
-                fat_per_100g=3.6,
-                category="protein",
-                suitable_meals=[],
-                availability=True
-            )
-        ]
+    ]
+}
+
+TARGET_MACROS = NutritionalTarget(
+    calories=2000,
+    protein=150,
+    carbohydrates=200,
+    fat=65
+)
+
+USER_PREFERENCES = UserPreferences(
+    dietary_restrictions=[],
+    allergies=[],
+    preferred_cuisines=["persian"],
+    calorie_preference="moderate",
+    protein_preference="high",
+    carb_preference="moderate",
+    fat_preference="moderate"
+)
+
+AVAILABLE_INGREDIENTS = [
+    Ingredient(
+        id="1",
+        name="Chicken Breast",
+        name_fa="سینه مرغ",
+        calories_per_100g=165,
+        protein_per_100g=31,
+        carbs_per_100g=0,
+        fat_per_100g=3.6,
+        category="protein",
+        suitable_meals=[],
+        availability=True
+    )
+]
+
+async def test_rag_method():
+    """Test the RAG optimization method directly"""
+    try:
+        print("Creating engine...")
+        engine = get_engine()
         
         print("Calling RAG optimization method...")
         result = await engine.optimize_rag_meal_plan(
-            rag_response=rag_response,
-            target_macros=target_macros,
-            user_preferences=user_preferences,
-            available_ingredients=available_ingredients
+            rag_response=RAG_RESPONSE,
+            target_macros=TARGET_MACROS,
+            user_preferences=USER_PREFERENCES,
+            available_ingredients=AVAILABLE_INGREDIENTS
         )
         
         print("✅ RAG optimization successful!")
@@ -3,113 +3,81 @@
 Simple RAG test client that works
 """
 
-import subprocess
+import httpx
 import json
 
+from test_fixtures import make_rag_request
+
+# Prefer orjson for JSON encoding and decoding when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# simdjson parses the response lazily, so only the keys read below are materialized
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+    _PARSER = simdjson.Parser()
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
 def test_rag_simple():
     """Test RAG endpoint with simple data"""
     try:
         print("Testing RAG endpoint with simple data...")
         
         # Simple test data
-        test_data = {
-            "rag_response": {
-                "suggestions": [
-                    {
-                        "ingredients": [
-                            {
-                                "name": "Ground Beef",
-                                "amount": 200,
-                                "calories": 400,
-                                "protein": 40,
-                                "carbs": 0,
-                                "fat": 30
-                            }
-                        ]
-                    }
-                ]
-            },
-            "target_macros": {
-                "calories": 2000.0,
-                "protein": 150.0,
-                "carbohydrates": 200.0,
-                "fat": 65.0
-            },
-            "user_preferences": {
-                "dietary_restrictions": [],
-                "allergies": [],
-                "preferred_cuisines": ["persian"],
-                "calorie_preference": "moderate",
-                "protein_preference": "high",
-                "carb_preference": "moderate",
-                "fat_preference": "moderate"
-            },
-            "user_id": "test_user_simple"
-        }
-        
-        # Convert to JSON string
-        json_data = json.dumps(test_data)
-        
-        # Test with PowerShell
-        cmd = [
-            "powershell", "-Command",
-            f"Invoke-WebRequest -Uri 'http://localhost:8000/optimize-rag-meal' -Method POST -Body '{json_data}' -ContentType 'application/json'"
-        ]
+        test_data = make_rag_request("test_user_simple")
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Call the endpoint over HTTP without spawning PowerShell
+        response = httpx.post(
+            "http://localhost:8000/optimize-rag-meal",
+            content=orjson.dumps(test_data, default=dict) if ORJSON_AVAILABLE else json.dumps(test_data, default=dict),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
         
-        if result.returncode == 0:
+        if response.status_code == 200:
             print("✅ RAG optimization successful!")
+            print("Status: 200 OK")
+            print(f"Response preview: {response.text[:200]}...")
             
-            # Parse response
+            # Parse JSON
             try:
-                response_text = result.stdout
-                if '"StatusCode" : 200' in response_text:
-                    print("Status: 200 OK")
-                    
-                    # Extract content
-                    if '"Content" :' in response_text:
-                        content_start = response_text.find('"Content" :') + 12
-                        content_end = response_text.find('"RawContent" :')
-                        if content_end > content_start:
-                            content = response_text[content_start:content_end].strip()
-                            print(f"Response preview: {content[:200]}...")
-                            
-                            # Parse JSON
-                            try:
-                                response_data = json.loads(content)
-                                print(f"✅ Parsed JSON successfully!")
-                                print(f"Keys: {list(response_data.keys())}")
-                                
-                                if 'optimization_result' in response_data:
-                                    opt_result = response_data['optimization_result']
-                                    print(f"Optimization method: {opt_result.get('optimization_method', 'N/A')}")
-                                    print(f"Target achieved: {opt_result.get('target_achieved', 'N/A')}")
-                                
-                                if 'meal_plans' in response_data:
-                                    meal_plans = response_data['meal_plans']
-                                    print(f"Generated {len(meal_plans)} meal plans")
-                                
-                                if 'rag_enhancement' in response_data:
-                                    enhancement = response_data['rag_enhancement']
-                                    print(f"Added {len(enhancement.get('added_ingredients', []))} ingredients")
-                                
-                            except json.JSONDecodeError as e:
-                                print(f"JSON parse error: {e}")
-                                
-                    else:
-                        print("No content found in response")
-                        
+                if SIMDJSON_AVAILABLE:
+                    response_data = _PARSER.parse(response.content)
                 else:
-                    print(f"❌ Request failed: {result.stdout}")
-                    
-            except Exception as e:
-                print(f"Response parsing error: {e}")
+                    response_data = orjson.loads(response.content) if ORJSON_AVAILABLE else json.loads(response.content)
+                print(f"✅ Parsed JSON successfully!")
+                print(f"Keys: {list(response_data.keys())}")
+                
+                if 'optimization_result' in response_data:
+                    opt_result = response_data['optimization_result']
+                    print(f"Optimization method: {opt_result.get('optimization_method', 'N/A')}")
+                    print(f"Target achieved: {opt_result.get('target_achieved', 'N/A')}")
+                
+                if 'meal_plans' in response_data:
+                    meal_plans = response_data['meal_plans']
+                    print(f"Generated {len(meal_plans)} meal plans")
+                
+                if 'rag_enhancement' in response_data:
+                    enhancement = response_data['rag_enhancement']
+                    print(f"Added {len(enhancement.get('added_ingredients', []))} ingredients")
+                
+            except ValueError as e:
+                print(f"JSON parse error: {e}")
                 
         else:
-            print(f"❌ Request failed with return code: {result.returncode}")
-            print(f"Error: {result.stderr}")
+            print(f"❌ Request failed with status: {response.status_code}")
+            print(f"Error: {response.text}")
         
+    except (httpx.ConnectError, ConnectionRefusedError) as e:
+        # Server not up yet: expected, so skip the traceback
+        print(f"❌ Server unreachable: {e}")
+        return
+    
     except Exception as e:
         print(f"Test error: {e}")
         import traceback
@@ -3,71 +3,46 @@
 Simple RAG success test
 """
 
-import subprocess
+import httpx
 import json
 
+from test_fixtures import make_rag_request
+
+# Prefer orjson for JSON encoding and decoding when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_BANNER = "=" * 50
+_HEADER = "🚀 Testing RAG-based Meal Optimization\n" + _BANNER
+
 def test_rag_success():
     """Test RAG endpoint and show success"""
     try:
-        print("🚀 Testing RAG-based Meal Optimization")
-        print("=" * 50)
+        print(_HEADER)
         
         # Test data
-        test_data = {
-            "rag_response": {
-                "suggestions": [
-                    {
-                        "ingredients": [
-                            {
-                                "name": "Ground Beef",
-                                "amount": 200,
-                                "calories": 400,
-                                "protein": 40,
-                                "carbs": 0,
-                                "fat": 30
-                            }
-                        ]
-                    }
-                ]
-            },
-            "target_macros": {
-                "calories": 2000.0,
-                "protein": 150.0,
-                "carbohydrates": 200.0,
-                "fat": 65.0
-            },
-            "user_preferences": {
-                "dietary_restrictions": [],
-                "allergies": [],
-                "preferred_cuisines": ["persian"],
-                "calorie_preference": "moderate",
-                "protein_preference": "high",
-                "carb_preference": "moderate",
-                "fat_preference": "moderate"
-            },
-            "user_id": "test_user_success"
-        }
+        test_data = make_rag_request("test_user_success")
         
         print("📝 Testing RAG meal optimization...")
         
-        # Convert to JSON string
-        json_data = json.dumps(test_data)
-        
-        # Test with PowerShell
-        cmd = [
-            "powershell", "-Command",
-            f"Invoke-WebRequest -Uri 'http://localhost:8000/optimize-rag-meal' -Method POST -Body '{json_data}' -ContentType 'application/json'"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Call the endpoint over HTTP without spawning PowerShell
+        response = httpx.post(
+            "http://localhost:8000/optimize-rag-meal",
+            content=orjson.dumps(test_data, default=dict) if ORJSON_AVAILABLE else json.dumps(test_data, default=dict),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
         
-        if result.returncode == 0:
+        if response.status_code == 200:
             print("✅ RAG optimization successful!")
             print("Status: 200 OK")
             
             # Show success message
             print("\n🎉 RAG Optimization System is Working!")
-            print("=" * 50)
+            print(_BANNER)
             print("✅ Endpoint: /optimize-rag-meal")
             print("✅ Method: POST")
             print("✅ Response: 200 OK")
@@ -86,8 +61,8 @@ def test_rag_success():
             print("\n🚀 Ready for production use!")
             
         else:
-            print(f"❌ Request failed with return code: {result.returncode}")
-            print(f"Error: {result.stderr}")
+            print(f"❌ Request failed with status: {response.status_code}")
+            print(f"Error: {response.text}")
         
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
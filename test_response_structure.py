@@ -6,6 +6,8 @@ Test script to see the actual response structure from /optimize-meal
 import requests
 import json
 
+from _common import SESSION
+
 def test_response_structure():
     """Test and see the response structure"""
     
@@ -53,10 +55,9 @@ def test_response_structure():
     print("🚀 Sending request to /optimize-meal...")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:5000/optimize-meal",
-            json=test_data,
-            headers={"Content-Type": "application/json"}
+            json=test_data
         )
         
         print(f"📊 Response status: {response.status_code}")
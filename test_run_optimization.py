@@ -7,12 +7,13 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from rag_optimization_engine import RAGMealOptimizer
+from rag_optimization_engine import get_optimizer
 
 def test_run_optimization():
     """Test _run_optimization_methods method"""
     
-    optimizer = RAGMealOptimizer()
+    # Shared per-process instance, so other tests in the same run reuse it
+    optimizer = get_optimizer()
     
     print("🧪 Testing _run_optimization_methods Method")
     print("=" * 60)
@@ -6,6 +6,9 @@ Simple test script for SciPy optimization with custom ingredients
 import requests
 import json
 import time
+import numpy as np
+
+from _common import SESSION
 
 def test_scipy_optimization():
     """Test the scipy optimization endpoint"""
@@ -78,10 +81,9 @@ def test_scipy_optimization():
         # Send request to the endpoint
         print("🌐 Sending request to /test-scipy-optimization...")
         
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:5000/test-scipy-optimization",
             json=test_data,
-            headers={"Content-Type": "application/json"},
             timeout=30
         )
         
@@ -117,10 +119,14 @@ def test_scipy_optimization():
                     # Check target achievement
                     print(f"\n🎯 Target Achievement:")
                     targets = test_data["target_macros"]
-                    print(f"  • Calories: {'✅' if final_nutrition['calories'] >= targets['calories'] * 0.95 else '❌'} ({final_nutrition['calories']:.1f}/{targets['calories']})")
-                    print(f"  • Protein: {'✅' if final_nutrition['protein'] >= targets['protein'] * 0.95 else '❌'} ({final_nutrition['protein']:.1f}/{targets['protein']})")
-                    print(f"  • Carbs: {'✅' if final_nutrition['carbs'] >= targets['carbs'] * 0.95 else '❌'} ({final_nutrition['carbs']:.1f}/{targets['carbs']})")
-                    print(f"  • Fat: {'✅' if final_nutrition['fat'] >= targets['fat'] * 0.95 else '❌'} ({final_nutrition['fat']:.1f}/{targets['fat']})")
+                    keys = ('calories', 'protein', 'carbs', 'fat')
+                    got = np.array([final_nutrition[k] for k in keys])
+                    tgt = np.array([targets[k] for k in keys])
+                    achieved = got >= tgt * 0.95
+                    print("\n".join([
+                        f"  • {k.capitalize()}: {'✅' if ok else '❌'} ({g:.1f}/{targets[k]})"
+                        for k, g, ok in zip(keys, got, achieved)
+                    ]))
                 else:
                     print(f"❌ Optimization failed: {opt_result.get('error', 'Unknown error')}")
             
@@ -144,17 +150,15 @@ def test_scipy_optimization():
 
 def calculate_final_nutrition(ingredients, quantities):
     """Calculate final nutrition based on optimized quantities"""
-    totals = {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0}
-    
-    for i, ingredient in enumerate(ingredients):
-        if i < len(quantities):
-            quantity = quantities[i] / 100  # Convert grams to ratio
-            totals['calories'] += ingredient['calories_per_100g'] * quantity
-            totals['protein'] += ingredient['protein_per_100g'] * quantity
-            totals['carbs'] += ingredient['carbs_per_100g'] * quantity
-            totals['fat'] += ingredient['fat_per_100g'] * quantity
+    n = min(len(ingredients), len(quantities))
+    macros = np.array(
+        [[ing['calories_per_100g'], ing['protein_per_100g'], ing['carbs_per_100g'], ing['fat_per_100g']] for ing in ingredients[:n]],
+        dtype=np.float64
+    ).reshape(n, 4)
     
-    return totals
+    # Grams to ratio, then one matvec for all four macros
+    totals = (np.asarray(quantities[:n], dtype=np.float64) / 100) @ macros
+    return dict(zip(('calories', 'protein', 'carbs', 'fat'), totals.tolist()))
 
 if __name__ == "__main__":
     print("🍽️  SciPy Optimization Test Script")
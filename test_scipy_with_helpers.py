@@ -8,6 +8,8 @@ import requests
 import json
 import time
 
+from _common import SESSION
+
 def test_scipy_with_helpers():
     """Test the scipy optimization with helpers endpoint"""
     
@@ -79,10 +81,9 @@ def test_scipy_with_helpers():
         # Send request to the new endpoint
         print("🌐 Sending request to /test-scipy-with-helpers...")
         
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:5000/test-scipy-with-helpers",
             json=test_data,
-            headers={"Content-Type": "application/json"},
             timeout=30
         )
         
@@ -3,8 +3,68 @@
 Simple Workflow Test
 """
 
+import atexit
+import os
+import queue
 import subprocess
+import tempfile
+import threading
 import json
+import numpy as np
+
+# Marker written after each script so replies can be read off the shared session
+_PS_SENTINEL = "---END---"
+# Seconds allowed per request; the reader waits a little longer so PowerShell's own timeout fires first
+REQUEST_TIMEOUT = 30
+_READ_TIMEOUT = REQUEST_TIMEOUT + 5
+_ps = None
+_ps_lines = None
+
+def _close_powershell():
+    """Shut down the shared PowerShell session"""
+    if _ps is not None:
+        _ps.stdin.close()
+        _ps.wait()
+
+atexit.register(_close_powershell)
+
+def _read_lines(stdout, lines: queue.Queue):
+    """Forward session output line by line; None marks end of output"""
+    for line in stdout:
+        lines.put(line)
+    lines.put(None)
+
+def run_powershell(script: str, timeout: float = _READ_TIMEOUT):
+    """Run a script in one long-lived PowerShell session, return (ok, output)"""
+    global _ps, _ps_lines
+    if _ps is None:
+        _ps = subprocess.Popen(
+            ["powershell", "-NoProfile", "-Command", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace"
+        )
+        _ps_lines = queue.Queue()
+        threading.Thread(target=_read_lines, args=(_ps.stdout, _ps_lines), daemon=True).start()
+    
+    _ps.stdin.write(f"{script}; Write-Output \"{_PS_SENTINEL}$?\"\n")
+    _ps.stdin.flush()
+    
+    lines = []
+    while True:
+        try:
+            line = _ps_lines.get(timeout=timeout)
+        except queue.Empty:
+            # A hung session cannot be reused; kill it so the next call starts fresh
+            _ps.kill()
+            _ps.wait()
+            _ps = None
+            lines.append(f"Timed out after {timeout}s waiting for PowerShell\n")
+            return False, "".join(lines)
+        if line is None:
+            return False, "".join(lines)
+        if line.startswith(_PS_SENTINEL):
+            return line.strip().endswith("True"), "".join(lines)
+        lines.append(line)
 
 def test_simple_workflow():
     """Test the simple workflow"""
@@ -56,79 +116,88 @@ def test_simple_workflow():
         
         print("\n🔧 Calling optimization API...")
         
-        # Convert to JSON string
-        json_data = json.dumps(test_data)
+        # Write the JSON body to a file so it never passes through PowerShell quoting
+        with tempfile.NamedTemporaryFile("wb", suffix=".json", delete=False) as tf:
+            tf.write(json.dumps(test_data).encode("utf-8"))
         
-        # Test with PowerShell
-        cmd = [
-            "powershell", "-Command",
-            f"Invoke-WebRequest -Uri 'http://localhost:8000/optimize-rag-meal' -Method POST -Body '{json_data}' -ContentType 'application/json'"
-        ]
+        # Single quotes are doubled inside a PowerShell single-quoted string
+        in_file = tf.name.replace("'", "''")
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Test with PowerShell
+        try:
+            ok, response_text = run_powershell(
+                f"(Invoke-WebRequest -UseBasicParsing -Uri 'http://localhost:8000/optimize-rag-meal' -Method POST -InFile '{in_file}' -ContentType 'application/json' -TimeoutSec {REQUEST_TIMEOUT}).Content"
+            )
+        finally:
+            os.unlink(tf.name)
         
-        if result.returncode == 0:
+        if ok:
             print("✅ API Call: SUCCESS")
             
-            # Parse response
-            response_text = result.stdout
-            if '"StatusCode" : 200' in response_text:
-                print("Status: 200 OK")
+            # Only the body is returned; Invoke-WebRequest fails the call on non-2xx statuses
+            print("Status: 200 OK")
+            
+            try:
+                response_data = json.loads(response_text)
+                print(f"✅ Response parsed successfully!")
                 
-                # Extract content
-                if '"Content" :' in response_text:
-                    content_start = response_text.find('"Content" :') + 12
-                    content_end = response_text.find('"RawContent" :')
-                    if content_end > content_start:
-                        content = response_text[content_start:content_end].strip()
-                        
-                        try:
-                            response_data = json.loads(content)
-                            print(f"✅ Response parsed successfully!")
-                            
-                            # Show results
-                            optimization_result = response_data.get('optimization_result', {})
-                            print(f"\n📊 Results:")
-                            print(f"  - Method: {optimization_result.get('optimization_method', 'N/A')}")
-                            print(f"  - Target achieved: {optimization_result.get('target_achieved', 'N/A')}")
-                            
-                            # Show meal plans
-                            meal_plans = response_data.get('meal_plans', [])
-                            print(f"\n🍽️ Generated {len(meal_plans)} meal plans:")
-                            
-                            for meal_plan in meal_plans:
-                                meal_time = meal_plan.get('meal_time', 'Unknown')
-                                total_calories = meal_plan.get('total_calories', 0)
-                                print(f"  • {meal_time}: {total_calories:.1f} cal")
-                            
-                            # Show daily totals
-                            daily_totals = response_data.get('daily_totals', {})
-                            if daily_totals:
-                                print(f"\n📈 Daily Totals:")
-                                print(f"  - Calories: {daily_totals.get('calories', 0):.1f} / {test_data['target_macros']['calories']}")
-                                print(f"  - Protein: {daily_totals.get('protein', 0):.1f}g / {test_data['target_macros']['protein']}g")
-                                print(f"  - Carbs: {daily_totals.get('carbohydrates', 0):.1f}g / {test_data['target_macros']['carbohydrates']}g")
-                                print(f"  - Fat: {daily_totals.get('fat', 0):.1f}g / {test_data['target_macros']['fat']}g")
-                            
-                            # Show RAG enhancement
-                            if 'rag_enhancement' in response_data:
-                                enhancement = response_data['rag_enhancement']
-                                print(f"\n🔧 RAG Enhancement:")
-                                print(f"  - Added ingredients: {len(enhancement.get('added_ingredients', []))}")
-                                print(f"  - Notes: {enhancement.get('enhancement_notes', 'N/A')}")
-                            
-                            print(f"\n🎉 SUCCESS! System is working correctly!")
-                            print("=" * 50)
-                            print("✅ RAG → Site → This API: WORKING")
-                            print("✅ Optimization: SUCCESSFUL")
-                            print("✅ Ready for your main site integration!")
-                            
-                        except json.JSONDecodeError as e:
-                            print(f"JSON parse error: {e}")
-                            
+                # Show results
+                optimization_result = response_data.get('optimization_result', {})
+                print(f"\n📊 Results:")
+                print(f"  - Method: {optimization_result.get('optimization_method', 'N/A')}")
+                print(f"  - Target achieved: {optimization_result.get('target_achieved', 'N/A')}")
+                
+                # Show meal plans
+                meal_plans = response_data.get('meal_plans', [])
+                print(f"\n🍽️ Generated {len(meal_plans)} meal plans:")
+                
+                if meal_plans:
+                    print("\n".join([
+                        f"  • {meal_plan.get('meal_time', 'Unknown')}: {meal_plan.get('total_calories', 0):.1f} cal"
+                        for meal_plan in meal_plans
+                    ]))
+                    
+                    # Sum the four macros across all plans in one vectorized reduction
+                    macros = np.fromiter(
+                        (m for p in meal_plans for m in (p.get('total_calories', 0), p.get('total_protein', 0), p.get('total_carbs', 0), p.get('total_fat', 0))),
+                        dtype=np.float32, count=len(meal_plans) * 4
+                    ).reshape(-1, 4)
+                    totals = macros.sum(axis=0)
+                    target = test_data['target_macros']
+                    diffs = totals - np.array([target['calories'], target['protein'], target['carbohydrates'], target['fat']], dtype=np.float32)
+                    print("  Σ Plans vs target: " + ", ".join([
+                        f"{name} {total:.1f} ({diff:+.1f})"
+                        for name, total, diff in zip(("calories", "protein", "carbs", "fat"), totals, diffs)
+                    ]))
+                
+                # Show daily totals
+                daily_totals = response_data.get('daily_totals', {})
+                if daily_totals:
+                    print(f"\n📈 Daily Totals:")
+                    print(f"  - Calories: {daily_totals.get('calories', 0):.1f} / {test_data['target_macros']['calories']}")
+                    print(f"  - Protein: {daily_totals.get('protein', 0):.1f}g / {test_data['target_macros']['protein']}g")
+                    print(f"  - Carbs: {daily_totals.get('carbohydrates', 0):.1f}g / {test_data['target_macros']['carbohydrates']}g")
+                    print(f"  - Fat: {daily_totals.get('fat', 0):.1f}g / {test_data['target_macros']['fat']}g")
+                
+                # Show RAG enhancement
+                if 'rag_enhancement' in response_data:
+                    enhancement = response_data['rag_enhancement']
+                    print(f"\n🔧 RAG Enhancement:")
+                    print(f"  - Added ingredients: {len(enhancement.get('added_ingredients', []))}")
+                    print(f"  - Notes: {enhancement.get('enhancement_notes', 'N/A')}")
+                
+                print(f"\n🎉 SUCCESS! System is working correctly!")
+                print("=" * 50)
+                print("✅ RAG → Site → This API: WORKING")
+                print("✅ Optimization: SUCCESSFUL")
+                print("✅ Ready for your main site integration!")
+                
+            except json.JSONDecodeError as e:
+                print(f"JSON parse error: {e}")
+            
         else:
             print(f"❌ API Call: FAILED")
-            print(f"Error: {result.stderr}")
+            print(f"Error: {response_text}")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")